@@ -3,7 +3,7 @@ import logging
 import requests
 import time
 import functools
-from typing import List, Dict, Any, Optional, Callable, Iterator, Union
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple, Union
 
 from config import (
     DEFAULT_TIMEOUT,
@@ -17,16 +17,30 @@ from config import (
     MAX_RETRIES,
     RETRY_BACKOFF_BASE,
     RETRY_BACKOFF_MULTIPLIER,
-    RETRY_MAX_DELAY
+    RETRY_MAX_DELAY,
+    BATCH_POLL_INTERVAL,
+    BATCH_COMPLETION_WINDOW,
+    BATCH_MAX_WAIT
 )
 from exceptions import (
     APIKeyMissingError,
     ModelNotSetError,
-    APIRequestError
+    APIRequestError,
+    BatchTimeoutError
 )
 
 log = logging.getLogger(__name__)
 
+# Optional faster JSON parsing for streamed chunks; orjson.JSONDecodeError
+# subclasses json.JSONDecodeError so the existing handlers still apply
+try:
+    import orjson
+    _json_loads = orjson.loads
+    ORJSON_AVAILABLE = True
+except ImportError:
+    _json_loads = json.loads
+    ORJSON_AVAILABLE = False
+
 
 def retry_with_backoff(max_retries: int = MAX_RETRIES,
                        backoff_base: float = RETRY_BACKOFF_BASE,
@@ -119,6 +133,9 @@ class APIClient:
     def __init__(self, name: str):
         self.name = name
         self.model: Optional[str] = None
+        # Keeps connections to the provider alive between requests. Fetching the model
+        # list when a provider is picked opens the connection the conversation reuses.
+        self.session = requests.Session()
 
     def set_model(self, model_name: str) -> None:
         """Set the model to use for generation."""
@@ -198,7 +215,7 @@ class OllamaClient(APIClient):
         messages = self._build_messages(prompt, system, conversation_history)
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_url}/chat",
                 json={
                     "model": self.model,
@@ -230,21 +247,21 @@ class OllamaClient(APIClient):
         messages = self._build_messages(prompt, system, conversation_history)
 
         try:
-            response = requests.post(
+            with self.session.post(
                 f"{self.api_url}/chat",
                 json={"model": self.model, "messages": messages, "stream": True},
                 stream=True,
                 timeout=DEFAULT_TIMEOUT,
-            )
-            response.raise_for_status()
-
-            for line in response.iter_lines():
-                if line:
-                    chunk = json.loads(line)
-                    if "content" in chunk["message"]:
-                        yield chunk["message"]["content"]
-                    if chunk.get("done"):
-                        break
+            ) as response:
+                response.raise_for_status()
+
+                for line in response.iter_lines():
+                    if line:
+                        chunk = _json_loads(line)
+                        if "content" in chunk["message"]:
+                            yield chunk["message"]["content"]
+                        if chunk.get("done"):
+                            break
         except requests.HTTPError as e:
             log.error(f"Ollama API HTTP error: {str(e)}")
             raise APIRequestError(
@@ -266,7 +283,7 @@ class OllamaClient(APIClient):
             List of model names
         """
         try:
-            response = requests.get(f"{self.api_url}/tags", timeout=MODEL_LIST_TIMEOUT)
+            response = self.session.get(f"{self.api_url}/tags", timeout=MODEL_LIST_TIMEOUT)
             response.raise_for_status()
             models = response.json().get("models", [])
             return [model["name"] for model in models]
@@ -305,7 +322,7 @@ class LMStudioClient(APIClient):
         messages = self._build_messages(prompt, system, conversation_history)
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/chat/completions",
                 json={
                     "model": self.model,
@@ -337,37 +354,37 @@ class LMStudioClient(APIClient):
         messages = self._build_messages(prompt, system, conversation_history)
 
         try:
-            response = requests.post(
+            with self.session.post(
                 f"{self.base_url}/chat/completions",
                 json={"model": self.model, "messages": messages, "stream": True},
                 stream=True,
                 timeout=DEFAULT_TIMEOUT,
-            )
-            response.raise_for_status()
-
-            for line in response.iter_lines():
-                if line:
-                    line_str = line.decode("utf-8").strip()
-                    if line_str.startswith("data: "):
-                        line_str = line_str[6:]
-                    if line_str == "[DONE]":
-                        break
-                    if not line_str:
-                        continue
-                    try:
-                        chunk = json.loads(line_str)
-                        if (
-                            "choices" in chunk
-                            and chunk["choices"]
-                            and "delta" in chunk["choices"][0]
-                            and "content" in chunk["choices"][0]["delta"]
-                        ):
-                            content = chunk["choices"][0]["delta"]["content"]
-                            if content:
-                                yield content
-                    except json.JSONDecodeError:
-                        log.warning(f"Failed to decode stream line: {line_str}")
-                        continue
+            ) as response:
+                response.raise_for_status()
+
+                for line in response.iter_lines():
+                    if line:
+                        line_str = line.decode("utf-8").strip()
+                        if line_str.startswith("data: "):
+                            line_str = line_str[6:]
+                        if line_str == "[DONE]":
+                            break
+                        if not line_str:
+                            continue
+                        try:
+                            chunk = _json_loads(line_str)
+                            if (
+                                "choices" in chunk
+                                and chunk["choices"]
+                                and "delta" in chunk["choices"][0]
+                                and "content" in chunk["choices"][0]["delta"]
+                            ):
+                                content = chunk["choices"][0]["delta"]["content"]
+                                if content:
+                                    yield content
+                        except json.JSONDecodeError:
+                            log.warning(f"Failed to decode stream line: {line_str}")
+                            continue
         except requests.HTTPError as e:
             log.error(f"LM Studio API HTTP error: {str(e)}")
             raise APIRequestError(
@@ -395,7 +412,7 @@ class LMStudioClient(APIClient):
                     models_url += '/models'
 
             log.info(f"Getting models from LM Studio at: {models_url}")
-            response = requests.get(models_url, timeout=MODEL_LIST_TIMEOUT)
+            response = self.session.get(models_url, timeout=MODEL_LIST_TIMEOUT)
             response.raise_for_status()
             models = response.json().get("data", [])
             return [model["id"] for model in models]
@@ -457,7 +474,7 @@ class OpenAICompatibleClient(APIClient):
             log.info(f"[{self.name}] Sending request to {self.base_url}/chat/completions")
             log.debug(f"[{self.name}] Payload: {json.dumps(data, indent=2)[:500]}...")
 
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/chat/completions",
                 headers=self.headers,
                 json=data,
@@ -507,38 +524,38 @@ class OpenAICompatibleClient(APIClient):
         }
 
         try:
-            response = requests.post(
+            with self.session.post(
                 f"{self.base_url}/chat/completions",
                 headers=self.headers,
                 json=data,
                 stream=True,
                 timeout=DEFAULT_TIMEOUT,
-            )
-            response.raise_for_status()
-
-            for line in response.iter_lines():
-                if line:
-                    line_str = line.decode("utf-8").strip()
-                    if line_str.startswith("data: "):
-                        line_str = line_str[6:]
-                    if line_str == "[DONE]":
-                        break
-                    if not line_str:
-                        continue
-                    try:
-                        chunk = json.loads(line_str)
-                        if (
-                            "choices" in chunk
-                            and chunk["choices"]
-                            and "delta" in chunk["choices"][0]
-                            and "content" in chunk["choices"][0]["delta"]
-                        ):
-                            content = chunk["choices"][0]["delta"]["content"]
-                            if content:
-                                yield content
-                    except json.JSONDecodeError:
-                        log.warning(f"Failed to decode stream line: {line_str}")
-                        continue
+            ) as response:
+                response.raise_for_status()
+
+                for line in response.iter_lines():
+                    if line:
+                        line_str = line.decode("utf-8").strip()
+                        if line_str.startswith("data: "):
+                            line_str = line_str[6:]
+                        if line_str == "[DONE]":
+                            break
+                        if not line_str:
+                            continue
+                        try:
+                            chunk = _json_loads(line_str)
+                            if (
+                                "choices" in chunk
+                                and chunk["choices"]
+                                and "delta" in chunk["choices"][0]
+                                and "content" in chunk["choices"][0]["delta"]
+                            ):
+                                content = chunk["choices"][0]["delta"]["content"]
+                                if content:
+                                    yield content
+                        except json.JSONDecodeError:
+                            log.warning(f"Failed to decode stream line: {line_str}")
+                            continue
         except requests.HTTPError as e:
             log.error(f"[{self.name}] HTTP error: {e}")
             raise APIRequestError(
@@ -561,7 +578,7 @@ class OpenAICompatibleClient(APIClient):
             return []
 
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/models",
                 headers=self.headers,
                 timeout=MODEL_LIST_TIMEOUT
@@ -597,3 +614,155 @@ class OpenAIClient(OpenAICompatibleClient):
         # Filter to only GPT models and sort
         gpt_models = [model for model in models if "gpt" in model.lower()]
         return sorted(gpt_models)
+
+
+class OpenAIBatchClient(OpenAIClient):
+    """OpenAI client that can also queue chat completions through the Batch API.
+
+    Batches cost less than real-time requests and don't count against the usual rate
+    limits, but complete asynchronously within BATCH_COMPLETION_WINDOW.
+    """
+
+    BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+    def _batch_request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a Batch/Files API request and raise APIRequestError on failure."""
+        try:
+            response = self.session.request(
+                method,
+                f"{self.base_url}{path}",
+                timeout=DEFAULT_TIMEOUT,
+                **kwargs
+            )
+            response.raise_for_status()
+            return response
+        except requests.HTTPError as e:
+            log.error(f"[{self.name}] Batch API HTTP error: {e}")
+            raise APIRequestError(
+                f"{self.name} Batch API request failed: {e.response.text}",
+                status_code=e.response.status_code,
+                response_text=e.response.text,
+            )
+        except requests.RequestException as e:
+            log.error(f"[{self.name}] Batch API request error: {e}")
+            raise APIRequestError(f"{self.name} Batch API request failed: {str(e)}")
+
+    def submit_batch(self, requests_: List[Tuple[str, str, str]]) -> str:
+        """Upload chat completion requests and start a batch.
+
+        Args:
+            requests_: (custom_id, prompt, system) tuples, one per completion
+
+        Returns:
+            The batch ID
+        """
+        if not self.api_key:
+            raise APIKeyMissingError(f"{self.name} API key not set")
+        if not self.model:
+            raise ModelNotSetError("Model must be set before generating responses")
+
+        lines = []
+        for custom_id, prompt, system in requests_:
+            lines.append(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": self._build_messages(prompt, system, []),
+                    "temperature": DEFAULT_TEMPERATURE,
+                    "max_tokens": DEFAULT_MAX_TOKENS
+                }
+            }))
+
+        # Multipart upload, so send only the auth header and let requests set the content type
+        auth = {'Authorization': self.headers['Authorization']}
+        upload = self._batch_request(
+            "POST", "/files",
+            headers=auth,
+            data={"purpose": "batch"},
+            files={"file": ("requests.jsonl", "\n".join(lines).encode("utf-8"))}
+        ).json()
+
+        batch = self._batch_request(
+            "POST", "/batches",
+            headers=self.headers,
+            json={
+                "input_file_id": upload["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": BATCH_COMPLETION_WINDOW
+            }
+        ).json()
+        log.info(f"[{self.name}] Submitted batch {batch['id']} with {len(lines)} requests")
+        return batch["id"]
+
+    def get_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Fetch the current state of a batch."""
+        return self._batch_request("GET", f"/batches/{batch_id}", headers=self.headers).json()
+
+    def wait_for_batch(self, batch_id: str, poll_interval: float = BATCH_POLL_INTERVAL,
+                       max_wait: float = BATCH_MAX_WAIT) -> Dict[str, Any]:
+        """Poll a batch until it reaches a terminal status and return its final state.
+
+        Raises BatchTimeoutError if it is still running after max_wait seconds. The batch
+        carries on server-side, so waiting on its ID again later picks up its results.
+        """
+        deadline = time.monotonic() + max_wait
+        while True:
+            batch = self.get_batch(batch_id)
+            status = batch.get("status")
+            if status in self.BATCH_TERMINAL_STATUSES:
+                log.info(f"[{self.name}] Batch {batch_id} finished with status '{status}'")
+                return batch
+            counts = batch.get("request_counts") or {}
+            log.info(
+                f"[{self.name}] Batch {batch_id} is {status} "
+                f"({counts.get('completed', 0)}/{counts.get('total', 0)} done)"
+            )
+            if time.monotonic() + poll_interval > deadline:
+                raise BatchTimeoutError(
+                    f"{self.name} batch {batch_id} is still {status} after {max_wait:.0f}s",
+                    batch_id=batch_id,
+                )
+            time.sleep(poll_interval)
+
+    def get_batch_results(self, batch: Dict[str, Any]) -> Dict[str, str]:
+        """Download a finished batch's output and map each custom_id to its response text.
+
+        Requests that failed inside the batch, and output lines that can't be parsed, are
+        logged and left out.
+        """
+        output_file_id = batch.get("output_file_id")
+        if not output_file_id:
+            raise APIRequestError(
+                f"{self.name} batch {batch.get('id')} ended with status "
+                f"'{batch.get('status')}' and produced no output"
+            )
+
+        content = self._batch_request("GET", f"/files/{output_file_id}/content", headers=self.headers)
+        results = {}
+        for line in content.iter_lines():
+            if not line:
+                continue
+            try:
+                entry = _json_loads(line)
+            except ValueError as e:
+                log.warning(f"[{self.name}] Skipping unparseable batch output line: {e}")
+                continue
+            if not isinstance(entry, dict):
+                log.warning(f"[{self.name}] Skipping unexpected batch output line: {line[:100]!r}")
+                continue
+            custom_id = entry.get("custom_id")
+            try:
+                body = entry["response"]["body"]
+                results[custom_id] = body["choices"][0]["message"]["content"].strip()
+            except (KeyError, IndexError, TypeError):
+                log.warning(f"[{self.name}] Batch request {custom_id} failed: {entry.get('error')}")
+        return results
+
+    def generate_batch_responses(self, requests_: List[Tuple[str, str, str]],
+                                 poll_interval: float = BATCH_POLL_INTERVAL,
+                                 max_wait: float = BATCH_MAX_WAIT) -> Dict[str, str]:
+        """Submit requests as a batch, wait for it to finish and return the responses by custom_id."""
+        batch_id = self.submit_batch(requests_)
+        return self.get_batch_results(self.wait_for_batch(batch_id, poll_interval, max_wait))
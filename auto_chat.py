@@ -16,11 +16,17 @@ Features:
 
 import os
 import sys
-import json
+import atexit
+import bisect
+import copy
+import re
 import time
 import logging
 import threading
 import random
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 import requests
@@ -28,7 +34,8 @@ from dotenv import load_dotenv
 from api_clients import APIClient, OllamaClient, LMStudioClient, OpenRouterClient, OpenAIClient
 from persona import Persona
 from conversation_history import ConversationHistory
-from utils.config_utils import load_json_with_comments
+from utils.response_cache import ResponseCache
+from utils.config_utils import load_json_with_comments, save_json
 from utils.analytics import summarize_conversation
 from utils.export_formats import export_conversation
 from exceptions import (
@@ -41,6 +48,7 @@ from exceptions import (
 # Tkinter imports
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, simpledialog, filedialog
+from tkinter import font as tkfont
 import ttkbootstrap as tkb
 from ttkbootstrap.constants import * # For constants like tk.NORMAL, tk.DISABLED etc.
 
@@ -67,7 +75,28 @@ from config import (
     DEFAULT_WINDOW_HEIGHT,
     MIN_WINDOW_WIDTH,
     MIN_WINDOW_HEIGHT,
-    DEFAULT_THEME
+    DEFAULT_THEME,
+    STREAM_REDRAW_INTERVAL,
+    UI_QUEUE_POLL_MS,
+    UI_QUEUE_MAX_BATCH,
+    MODEL_LIST_CACHE_TTL,
+    MODEL_FETCH_WORKERS,
+    PERSONA_SAVE_DELAY_MS,
+    MAX_RENDERED_MESSAGES,
+    RESPONSE_CACHE_ENABLED
+)
+
+# Characters outside the Basic Multilingual Plane (emoji and the like)
+_ASTRAL_RE = re.compile("[\U00010000-\U0010FFFF]")
+
+# Appended to the system prompt while a system or narrator message is being reacted to
+CRITICAL_INSTRUCTION_SUFFIX = (
+    "\n\nCRITICAL INSTRUCTION: When you receive an emergency alert or system message, you MUST:\n"
+    "1. Immediately acknowledge and react to the situation\n"
+    "2. Show appropriate urgency and emotion in your response\n"
+    "3. Take appropriate action based on the emergency\n"
+    "4. Temporarily pause any ongoing conversation topics\n"
+    "5. Focus entirely on the current situation until it is resolved"
 )
 
 # --- Configuration Loading/Saving ---
@@ -84,8 +113,7 @@ def load_config() -> Dict[str, Any]:
 def save_config(config_data: Dict[str, Any]):
     """Save configuration to JSON file."""
     try:
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config_data, f, indent=4)
+        save_json(CONFIG_FILE, config_data)
     except IOError as e:
         log.error(f"Error saving config file {CONFIG_FILE}: {e}")
 
@@ -93,9 +121,28 @@ def save_config(config_data: Dict[str, Any]):
 class ChatManager:
     """Manages the conversation logic, API interactions, and state."""
 
+    # UI instructions some models append to their replies, with optional trailing punctuation
+    _CLEAN_RE = re.compile(
+        r"\b(?:click reply or enter to continue"
+        r"|click reply or enter after each message"
+        r"|press enter to continue"
+        r"|type your response below"
+        r"|click to respond"
+        r"|please respond to continue our conversation"
+        r"|your turn to respond"
+        r"|click below to respond)[.!,]?",
+        re.IGNORECASE
+    )
+    # Substrings shared by every pattern above; responses without any of them skip the regex
+    _QUICK_MARKERS = (
+        "click reply", "press enter", "type your response", "click to respond",
+        "please respond to continue", "your turn to respond", "click below to respond",
+    )
+
     def __init__(self, app: 'ChatApp'):
         self.app = app
         self.personas: List[Persona] = []
+        self._persona_by_name: Dict[str, Persona] = {}  # Name index over self.personas
         self.api_clients: Dict[str, APIClient] = {
             "ollama": OllamaClient(),
             "lmstudio": LMStudioClient(),
@@ -106,15 +153,67 @@ class ChatManager:
         self.selected_clients: List[APIClient] = []
         self.selected_models: List[str] = []
         self.conversation: List[Dict[str, str]] = []
+        self.conversation_metadata: Dict[str, str] = {}
+        self._personas_str = ""
+        self._models_str = ""
         self.current_turn = 0
         self.max_turns = DEFAULT_MAX_TURNS
         self.conversation_theme = ""
+        # Events back is_running/is_paused so the loop can block instead of polling
+        self._stop_event = threading.Event()
+        self._resume_event = threading.Event()
         self.is_running = False
         self.is_paused = False
         self.chat_thread: Optional[threading.Thread] = None
+        # Set whenever no conversation loop is running
+        self.stopped_event = threading.Event()
+        self.stopped_event.set()
         self.history_limit = DEFAULT_HISTORY_LIMIT  # Limit the history sent to the API
+        # Rolling API history window per persona, role-mapped from that persona's point of view
+        self._history_by_perspective: Dict[str, deque] = {}
+        # Messages are appended from both the UI thread (narrator/system) and the
+        # conversation thread; numbering, appending and persisting must not interleave
+        self._append_lock = threading.Lock()
         self.history_manager = ConversationHistory()  # Initialize conversation history
+        self.history_conversation_id: Optional[int] = None  # History entry messages are appended to
+        # Exact-match cache of previous API responses, only when enabled in config
+        self.response_cache: Optional[ResponseCache] = ResponseCache() if RESPONSE_CACHE_ENABLED else None
         self.turn_order_strategy = "round-robin"  # Options: "round-robin", "random"
+        self.streaming = True  # Whether responses are streamed, fixed per conversation
+        # Keep the log file open (line-buffered) instead of reopening it per message
+        self._log_lock = threading.Lock()
+        self._log_fp = None
+        try:
+            self._log_fp = open(LOG_FILE, 'a', encoding='utf-8', buffering=1)
+            atexit.register(self._log_fp.close)
+        except OSError as e:
+            log.error(f"Failed to open log file {LOG_FILE}: {e}")
+
+    @property
+    def is_running(self) -> bool:
+        """Whether a conversation is in progress."""
+        return not self._stop_event.is_set()
+
+    @is_running.setter
+    def is_running(self, running: bool):
+        if running:
+            self._stop_event.clear()
+        else:
+            self._stop_event.set()
+            # Wake a paused loop so it can notice the stop
+            self._resume_event.set()
+
+    @property
+    def is_paused(self) -> bool:
+        """Whether the running conversation is paused."""
+        return not self._resume_event.is_set()
+
+    @is_paused.setter
+    def is_paused(self, paused: bool):
+        if paused:
+            self._resume_event.clear()
+        else:
+            self._resume_event.set()
 
     def load_personas(self):
         """Load personas from the JSON file."""
@@ -143,17 +242,53 @@ class ChatManager:
             log.exception(f"Error loading personas: {e}")
             messagebox.showerror("Error", f"Failed to load personas from {PERSONAS_FILE}: {e}")
             self.personas = [] # Ensure personas list is empty on error
+        self._reindex_personas()
 
     def save_personas(self):
         """Save current personas to the JSON file."""
         try:
-            with open(PERSONAS_FILE, 'w', encoding='utf-8') as f:
-                json.dump([p.to_dict() for p in self.personas], f, indent=4)
-            log.info(f"Saved {len(self.personas)} personas to {PERSONAS_FILE}")
+            self.write_personas([p.to_dict() for p in self.personas])
         except Exception as e:
             log.exception(f"Error saving personas: {e}")
             messagebox.showerror("Error", f"Failed to save personas to {PERSONAS_FILE}: {e}")
 
+    @staticmethod
+    def write_personas(personas_data: List[Dict[str, Any]]):
+        """Write serialized personas to the JSON file. Safe to call from a worker thread."""
+        save_json(PERSONAS_FILE, personas_data)
+        log.info(f"Saved {len(personas_data)} personas to {PERSONAS_FILE}")
+
+    def _reindex_personas(self):
+        """Rebuild the name index from self.personas, which stays the source of truth.
+
+        Names aren't guaranteed unique, so the first persona with a name wins, as a
+        linear search over the list would.
+        """
+        self._persona_by_name = {}
+        for persona in self.personas:
+            self._persona_by_name.setdefault(persona.name, persona)
+
+    def get_persona(self, name: str) -> Optional[Persona]:
+        """Look up a persona by name."""
+        return self._persona_by_name.get(name)
+
+    def add_persona(self, persona: Persona):
+        """Add a persona and index it by name."""
+        self.personas.append(persona)
+        self._persona_by_name.setdefault(persona.name, persona)
+
+    def remove_persona(self, name: str):
+        """Remove the persona found by name, leaving any others with the same name in place."""
+        persona = self._persona_by_name.get(name)
+        if persona is not None:
+            self.personas = [p for p in self.personas if p is not persona]
+            self._reindex_personas()
+
+    def rename_persona(self, persona: Persona, new_name: str):
+        """Rename a persona in place, keeping its position and the name index in sync."""
+        persona.name = new_name
+        self._reindex_personas()
+
     # --- Methods to be implemented later ---
     def save_conversation(self):
         """Save the current conversation log to a file."""
@@ -180,33 +315,26 @@ class ChatManager:
             return # User cancelled
 
         try:
-            # Prepare metadata for export
-            metadata = {
-                'theme': self.conversation_theme,
-                'persona1': self.selected_personas[0].name if len(self.selected_personas) > 0 else 'N/A',
-                'persona2': self.selected_personas[1].name if len(self.selected_personas) > 1 else 'N/A',
-                'model1': self.selected_models[0] if len(self.selected_models) > 0 else 'N/A',
-                'model2': self.selected_models[1] if len(self.selected_models) > 1 else 'N/A',
-            }
+            # Metadata is built once when the conversation starts
+            metadata = self.conversation_metadata or self._build_metadata()
 
             # Determine file format from extension
             file_ext = filepath.split('.')[-1].lower()
 
             if file_ext == 'json':
                 # Save as JSON
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    export_data = {
-                        'metadata': metadata,
-                        'conversation': self.conversation
-                    }
-                    json.dump(export_data, f, indent=4)
+                export_data = {
+                    'metadata': metadata,
+                    'conversation': self.conversation
+                }
+                save_json(filepath, export_data)
             elif file_ext == 'txt':
                 # Save as plain text
                 with open(filepath, 'w', encoding='utf-8') as f:
                     f.write(f"Conversation Log - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
                     f.write(f"Theme: {self.conversation_theme}\n")
-                    f.write(f"Personas: {metadata['persona1']} vs {metadata['persona2']}\n")
-                    f.write(f"Models: {metadata['model1']} vs {metadata['model2']}\n")
+                    f.write(f"Personas: {self._personas_str}\n")
+                    f.write(f"Models: {self._models_str}\n")
                     f.write("-" * 20 + "\n\n")
                     for msg in self.conversation:
                         f.write(f"{msg['persona']} ({msg['role']}):\n{msg['content']}\n\n")
@@ -218,8 +346,8 @@ class ChatManager:
                 with open(filepath, 'w', encoding='utf-8') as f:
                     f.write(f"Conversation Log - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
                     f.write(f"Theme: {self.conversation_theme}\n")
-                    f.write(f"Personas: {metadata['persona1']} vs {metadata['persona2']}\n")
-                    f.write(f"Models: {metadata['model1']} vs {metadata['model2']}\n")
+                    f.write(f"Personas: {self._personas_str}\n")
+                    f.write(f"Models: {self._models_str}\n")
                     f.write("-" * 20 + "\n\n")
                     for msg in self.conversation:
                         f.write(f"{msg['persona']} ({msg['role']}):\n{msg['content']}\n\n")
@@ -240,8 +368,14 @@ class ChatManager:
             return
 
         self.conversation = []
+        self._history_by_perspective = {
+            persona.name: deque(maxlen=self.history_limit) for persona in self.selected_personas
+        }
+        self.history_conversation_id = None
         self.current_turn = 0
         self.conversation_theme = theme
+        # Read Tk state here on the main thread; the loop runs on a worker thread
+        self.streaming = self.app.streaming_var.get()
         self.is_running = True
         self.is_paused = False
 
@@ -251,19 +385,26 @@ class ChatManager:
             self.is_running = False
             return
 
+        # Selection-derived strings, computed once per conversation rather than on every save
+        self._personas_str = " vs ".join(p.name for p in self.selected_personas)
+        self._models_str = " vs ".join(self.selected_models)
+        self.conversation_metadata = self._build_metadata()
+
         log.info(f"Starting conversation. Theme: '{theme}', Turn order: {self.turn_order_strategy}")
+        log.info(f"Personas: {self._personas_str}")
         for i, persona in enumerate(self.selected_personas):
             log.info(f"Persona {i+1}: {persona.name} ({self.selected_clients[i].name} - {self.selected_models[i]})")
         log.info(f"Max turns: {self.max_turns}")
 
         # Update GUI status
-        self.app.after(0, self.app.update_status, "Conversation starting...")
-        self.app.after(0, self.app.enable_controls, True)
+        self.app.post_to_ui(self.app.update_status, "Conversation starting...")
+        self.app.post_to_ui(self.app.enable_controls, True)
         # Use lambdas for config calls via after
-        self.app.after(0, lambda: self.app.pause_button.config(text="Pause", bootstyle="warning")) 
-        self.app.after(0, lambda: self.app.narrator_button.config(state=DISABLED, bootstyle="secondary-disabled"))
+        self.app.post_to_ui(lambda: self.app.pause_button.config(text="Pause", bootstyle="warning")) 
+        self.app.post_to_ui(lambda: self.app.narrator_button.config(state=DISABLED, bootstyle="secondary-disabled"))
 
         # Start the conversation loop in a new thread
+        self.stopped_event.clear()
         self.chat_thread = threading.Thread(target=self._run_conversation_loop, daemon=True)
         self.chat_thread.start()
 
@@ -274,12 +415,17 @@ class ChatManager:
             last_message_content = "Let's start the conversation." # Initial prompt for the first AI
             system_message_added = False
 
+            # Loop invariants, looked up once instead of on every turn
+            personas = self.selected_personas
+            clients = self.selected_clients
+            num_personas = len(personas)
+            streaming = self.streaming
+            random_order = self.turn_order_strategy == "random"
+
             while self.is_running and self.current_turn < self.max_turns:
                 # --- Pause Handling ---
-                while self.is_paused and self.is_running:
-                    time.sleep(0.1) # Reduced sleep time for more responsive pause
-                    if not self.is_running: # Check if stopped while paused
-                         break
+                # Blocks while paused; resuming or stopping wakes it immediately
+                self._resume_event.wait()
                 
                 if not self.is_running: # Exit loop if stopped
                     break
@@ -291,95 +437,90 @@ class ChatManager:
                 ]
                 
                 # --- Determine Current Actor ---
-                num_personas = len(self.selected_personas)
-                if self.turn_order_strategy == "random":
+                if random_order:
                     actor_index = random.randint(0, num_personas - 1)
                 else:  # round-robin
                     actor_index = self.current_turn % num_personas
-                current_persona = self.selected_personas[actor_index]
-                current_client = self.selected_clients[actor_index]
+                current_persona = personas[actor_index]
+                current_client = clients[actor_index]
                 
                 # Update status on main thread
-                self.app.after(0, self.app.update_status, f"Turn {self.current_turn + 1}/{self.max_turns}: {current_persona.name} is thinking...")
-                log.debug(f"Turn {self.current_turn + 1}: '{current_persona.name}' is thinking...")
+                self.app.post_to_ui(self.app.update_status, f"Turn {self.current_turn + 1}/{self.max_turns}: {current_persona.name} is thinking...")
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("Turn %d: '%s' is thinking...", self.current_turn + 1, current_persona.name)
 
                 # --- Prepare API Request --- 
                 try:
-                    # Format conversation history for API
-                    api_history = []
-                    history_start_index = max(0, len(self.conversation) - self.history_limit)
-                    
-                    for msg in self.conversation[history_start_index:]:
-                        if msg["role"] == "system":
-                            # Add system messages with emphasis
-                            api_history.append({
-                                "role": "system",
-                                "content": f"IMPORTANT - MUST ACKNOWLEDGE AND REACT TO THIS IMMEDIATELY: {msg['content']}"
-                            })
-                        elif msg["role"] == "narrator":
-                            # Add narrator messages as urgent system messages
-                            api_history.append({
-                                "role": "system",
-                                "content": f"URGENT SCENE CHANGE - REACT TO THIS IMMEDIATELY: {msg['content']}"
-                            })
-                        elif msg["role"] in ("assistant", "user"):
-                            # Map messages from the current persona as 'assistant' and the other as 'user'
-                            role = "assistant" if msg["persona"] == current_persona.name else "user"
-                            api_history.append({"role": role, "content": msg["content"]})
-                        else:
-                            api_history.append({"role": "user", "content": msg["content"]})
-
-                    # Get base system prompt
-                    system_prompt = current_persona.get_system_prompt(self.conversation_theme)
-                    
-                    # Modify prompt if there are recent system messages
-                    if recent_system_messages:
-                        last_system = recent_system_messages[-1]
-                        # Inject the system message directly into the prompt
-                        prompt = f"EMERGENCY ALERT - {last_system['content']}\n\nYou MUST acknowledge and react to this situation immediately before continuing any previous conversation. How do you respond to this urgent situation?"
-                        
-                        # Add emphasis to system prompt
-                        system_prompt = system_prompt + "\n\nCRITICAL INSTRUCTION: When you receive an emergency alert or system message, you MUST:\n1. Immediately acknowledge and react to the situation\n2. Show appropriate urgency and emotion in your response\n3. Take appropriate action based on the emergency\n4. Temporarily pause any ongoing conversation topics\n5. Focus entirely on the current situation until it is resolved"
-                    else:
-                        prompt = last_message_content
+                    prompt, system_prompt, api_history = self._prepare_turn_request(
+                        current_persona, last_message_content, recent_system_messages
+                    )
                     
                     # Log what's being sent to the API
-                    log.info(f"Sending to API - System Prompt: {system_prompt[:100]}...")
-                    log.info(f"Sending to API - Current Prompt: {prompt[:100]}...")
-                    log.info(f"Sending to API - History Length: {len(api_history)}")
+                    log.info("Sending to API - System Prompt: %.100s...", system_prompt)
+                    log.info("Sending to API - Current Prompt: %.100s...", prompt)
+                    log.info("Sending to API - History Length: %d", len(api_history))
                     
                     # --- Call API in try block ---
                     start_time = time.time()
-                    if self.app.streaming_var.get():
+                    if streaming:
                         # --- Streaming Response ---
-                        response_content = ""
+                        chunks: List[str] = []
+                        pending_start = 0  # First chunk not yet sent to the display
+                        last_update_ts = 0.0
                         new_role = "assistant" if actor_index == 0 else "user"
 
-                        # Prepare the message placeholder
+                        # The message is only added to the conversation once the stream completes
                         new_msg = {"role": new_role, "persona": current_persona.name, "content": ""}
-                        self.conversation.append(new_msg)
-
-                        # Get the stream
-                        stream = current_client.generate_streaming_response(
-                            prompt=prompt, system=system_prompt, conversation_history=api_history
-                        )
+                        self.app.post_to_ui(self.app.begin_stream_message, new_msg)
+
+                        # Get the stream, replaying a cached response as a single chunk
+                        cached_response = None
+                        if self.response_cache is not None:
+                            cache_key = ResponseCache.make_key(
+                                current_client.name, current_client.model, system_prompt, prompt, api_history
+                            )
+                            cached_response = self.response_cache.get(cache_key)
+                        try:
+                            if cached_response is not None:
+                                stream = [cached_response]
+                            else:
+                                stream = current_client.generate_streaming_response(
+                                    prompt=prompt, system=system_prompt, conversation_history=api_history
+                                )
 
-                        # Process stream
-                        for chunk in stream:
-                            if not self.is_running:
-                                break
-                            response_content += chunk
-                            new_msg["content"] = self._clean_model_response(response_content)
-                            self.app.after(0, self.app.update_conversation_display, True) # Stream update
+                            # Process stream
+                            for chunk in stream:
+                                if not self.is_running:
+                                    break
+                                chunks.append(chunk)
+                                # Send new text to the display in batches, at most as often as it can redraw
+                                now = time.monotonic()
+                                if now - last_update_ts >= STREAM_REDRAW_INTERVAL:
+                                    self.app.post_to_ui(self.app.append_stream_text, "".join(chunks[pending_start:]))
+                                    pending_start = len(chunks)
+                                    last_update_ts = now
+                        except Exception:
+                            # Nothing was added to the conversation; just drop the partial text from the display
+                            self.app.post_to_ui(self.app.discard_stream_message)
+                            raise
+
+                        # Only cache streams that were collected in full
+                        if self.response_cache is not None and cached_response is None and self.is_running:
+                            self.response_cache.put(cache_key, "".join(chunks))
+
+                        response_content = self._clean_model_response("".join(chunks).strip())
+                        new_msg["content"] = response_content
+                        self.append_message(new_msg)
+
+                        # Replace the raw streamed text with the cleaned response and drop the cursor
+                        self.app.post_to_ui(self.app.end_stream_message, response_content)
 
                         if not self.is_running:
                             break
                     else:
                         # --- Non-Streaming Response ---
-                        response_content = current_client.generate_response(
-                            prompt=prompt,
-                            system=system_prompt,
-                            conversation_history=api_history
+                        response_content = self._generate_response(
+                            current_client, prompt, system_prompt, api_history
                         )
                         response_content = self._clean_model_response(response_content.strip())
                         new_role = "assistant" if actor_index == 0 else "user"
@@ -388,11 +529,12 @@ class ChatManager:
                             "persona": current_persona.name,
                             "content": response_content,
                         }
-                        self.conversation.append(new_msg)
-                        self.app.after(0, self.app.update_conversation_display)
+                        self.append_message(new_msg)
+                        self.app.post_to_ui(self.app.update_conversation_display)
 
                     end_time = time.time()
-                    log.debug(f"'{current_persona.name}' generated response in {end_time - start_time:.2f} seconds.")
+                    if log.isEnabledFor(logging.DEBUG):
+                        log.debug("'%s' generated response in %.2f seconds.", current_persona.name, end_time - start_time)
 
                     if not self.is_running: # Check if stopped during API call
                         break
@@ -400,38 +542,35 @@ class ChatManager:
                     # Log the complete message
                     self._log_message(new_msg)
                     last_message_content = response_content
-                    self.app.after(0, self.app.update_status, f"Turn {self.current_turn + 1}/{self.max_turns}: Waiting...")
+                    self.app.post_to_ui(self.app.update_status, f"Turn {self.current_turn + 1}/{self.max_turns}: Waiting...")
 
                     # Increment turn
                     self.current_turn += 1
 
-                    # Small delay between turns, but check is_running frequently
-                    for _ in range(10):  # Split 1 second delay into 10 parts
-                        if not self.is_running:
-                            break
-                        time.sleep(0.1)
+                    # Small delay between turns, cut short if the conversation is stopped
+                    self._stop_event.wait(1.0)
 
                 except APIKeyMissingError as e:
-                    log.error(f"API key error during turn {self.current_turn + 1}: {e}")
+                    log.error("API key error during turn %d: %s", self.current_turn + 1, e)
                     error_msg = f"API Key Error: {str(e)}"
-                    self.app.after(0, self.app.update_status, error_msg)
-                    self.app.after(0, messagebox.showerror, "API Key Error", str(e))
+                    self.app.post_to_ui(self.app.update_status, error_msg)
+                    self.app.post_to_ui(messagebox.showerror, "API Key Error", str(e))
                     self.is_running = False
                     break
                 except ModelNotSetError as e:
-                    log.error(f"Model not set error during turn {self.current_turn + 1}: {e}")
+                    log.error("Model not set error during turn %d: %s", self.current_turn + 1, e)
                     error_msg = f"Model Error: {str(e)}"
-                    self.app.after(0, self.app.update_status, error_msg)
+                    self.app.post_to_ui(self.app.update_status, error_msg)
                     self.is_running = False
                     break
                 except APIRequestError as e:
-                    log.error(f"API request error during turn {self.current_turn + 1}: {e}")
+                    log.error("API request error during turn %d: %s", self.current_turn + 1, e)
                     error_msg = f"API Request Error during {current_persona.name}'s turn: {str(e)}"
 
                     # Try fallback model if configured
                     if current_persona.fallback_provider and current_persona.fallback_model:
-                        log.info(f"Attempting fallback to {current_persona.fallback_provider}/{current_persona.fallback_model}")
-                        self.app.after(0, self.app.update_status, f"Primary model failed. Trying fallback model...")
+                        log.info("Attempting fallback to %s/%s", current_persona.fallback_provider, current_persona.fallback_model)
+                        self.app.post_to_ui(self.app.update_status, f"Primary model failed. Trying fallback model...")
 
                         try:
                             # Get fallback client
@@ -463,34 +602,34 @@ class ChatManager:
                                     "persona": current_persona.name,
                                     "content": response_content
                                 }
-                                self.conversation.append(new_msg)
+                                self.append_message(new_msg)
                                 self._log_message(new_msg)
                                 last_message_content = response_content
 
                                 # Update GUI
-                                self.app.after(0, self.app.update_conversation_display)
-                                self.app.after(0, self.app.update_status,
+                                self.app.post_to_ui(self.app.update_conversation_display)
+                                self.app.post_to_ui(self.app.update_status,
                                              f"Turn {self.current_turn + 1}/{self.max_turns}: Completed with fallback model")
 
                                 # Increment turn and continue
                                 self.current_turn += 1
                                 continue
                             else:
-                                log.error(f"Fallback client '{current_persona.fallback_provider}' not found")
+                                log.error("Fallback client '%s' not found", current_persona.fallback_provider)
                         except Exception as fallback_error:
-                            log.error(f"Fallback model also failed: {fallback_error}")
-                            self.app.after(0, self.app.update_status,
+                            log.error("Fallback model also failed: %s", fallback_error)
+                            self.app.post_to_ui(self.app.update_status,
                                          f"Both primary and fallback models failed for {current_persona.name}")
 
                     # If we get here, no fallback or fallback failed
-                    self.app.after(0, self.app.update_status, error_msg)
+                    self.app.post_to_ui(self.app.update_status, error_msg)
                     # Continue to next turn instead of stopping the conversation
                     self.current_turn += 1
                     continue
                 except Exception as e:
-                    log.exception(f"Unexpected error during turn {self.current_turn + 1}")
+                    log.exception("Unexpected error during turn %d", self.current_turn + 1)
                     error_msg = f"Unexpected error during {current_persona.name}'s turn: {str(e)}"
-                    self.app.after(0, self.app.update_status, error_msg)
+                    self.app.post_to_ui(self.app.update_status, error_msg)
                     self.is_running = False
                     break
 
@@ -499,63 +638,144 @@ class ChatManager:
             log.info(final_status)
             
             # Schedule final UI updates on main thread
-            self.app.after(0, self.app.update_status, final_status)
-            self.app.after(0, self.app.enable_controls, False)
-            self.app.after(0, lambda: self.app.pause_button.config(text="Pause", bootstyle="warning"))
+            self.app.post_to_ui(self.app.update_status, final_status)
+            self.app.post_to_ui(self.app.enable_controls, False)
+            self.app.post_to_ui(lambda: self.app.pause_button.config(text="Pause", bootstyle="warning"))
 
         except Exception as e:
             log.exception("Fatal error in conversation loop")
-            self.app.after(0, self.app.update_status, f"Fatal error: {str(e)}")
-            self.app.after(0, self.app.enable_controls, False)
+            self.app.post_to_ui(self.app.update_status, f"Fatal error: {str(e)}")
+            self.app.post_to_ui(self.app.enable_controls, False)
         finally:
             self.is_running = False
             summary = summarize_conversation(self.conversation)
             log.info("Conversation summary:\n" + summary)
 
-            # Auto-save to history if conversation has content
-            if len(self.conversation) > 1: # Only save if there's more than the initial prompt
+            # Messages were saved to history as they arrived; drop the entry if there's
+            # no more than the initial prompt
+            if self.history_conversation_id is not None and len(self.conversation) <= 1:
                 try:
-                    metadata = {
-                        'theme': self.conversation_theme,
-                        'persona1': self.selected_personas[0].name if self.selected_personas else 'N/A',
-                        'persona2': self.selected_personas[1].name if len(self.selected_personas) > 1 else 'N/A',
-                        'model1': self.selected_models[0] if self.selected_models else 'N/A',
-                        'model2': self.selected_models[1] if len(self.selected_models) > 1 else 'N/A',
-                    }
-                    conversation_id = self.history_manager.save_conversation(self.conversation, metadata)
-                    log.info(f"Conversation auto-saved to history with ID: {conversation_id}")
+                    self.history_manager.delete_conversation(self.history_conversation_id)
+                    self.history_conversation_id = None
                 except Exception as e:
-                    log.error(f"Failed to auto-save conversation to history: {e}")
+                    log.error(f"Failed to discard empty conversation from history: {e}")
+            elif self.history_conversation_id is not None:
+                log.info(f"Conversation saved to history with ID: {self.history_conversation_id}")
 
             log.info("Conversation loop finished.")
+            self.stopped_event.set()
+            self.app.post_to_ui(self.app.on_conversation_stopped)
+
+    def _build_metadata(self) -> Dict[str, str]:
+        """Metadata describing the current conversation for exports and the history database."""
+        return {
+            'theme': self.conversation_theme,
+            'persona1': self.selected_personas[0].name if self.selected_personas else 'N/A',
+            'persona2': self.selected_personas[1].name if len(self.selected_personas) > 1 else 'N/A',
+            'model1': self.selected_models[0] if self.selected_models else 'N/A',
+            'model2': self.selected_models[1] if len(self.selected_models) > 1 else 'N/A',
+        }
+
+    def _persist_message(self, msg: Dict[str, str], turn_number: int):
+        """Append a message to the conversation's history entry, creating it on first use."""
+        try:
+            if self.history_conversation_id is None:
+                self.history_conversation_id = self.history_manager.create_conversation(self.conversation_metadata)
+            self.history_manager.append_message(self.history_conversation_id, msg, turn_number)
+        except Exception as e:
+            log.error(f"Failed to save message to history: {e}")
+
+    def append_message(self, msg: Dict[str, str]):
+        """Append a message to the conversation, every persona's API history window and the history database."""
+        with self._append_lock:
+            turn_number = len(self.conversation)
+            self.conversation.append(msg)
+            if msg["role"] in ("assistant", "user"):
+                # Map messages from each persona's own point of view: its own turns are 'assistant'
+                for name, history in self._history_by_perspective.items():
+                    history.append({"role": "assistant" if msg["persona"] == name else "user", "content": msg["content"]})
+            else:
+                if msg["role"] == "system":
+                    # Add system messages with emphasis
+                    entry = {
+                        "role": "system",
+                        "content": f"IMPORTANT - MUST ACKNOWLEDGE AND REACT TO THIS IMMEDIATELY: {msg['content']}"
+                    }
+                elif msg["role"] == "narrator":
+                    # Add narrator messages as urgent system messages
+                    entry = {
+                        "role": "system",
+                        "content": f"URGENT SCENE CHANGE - REACT TO THIS IMMEDIATELY: {msg['content']}"
+                    }
+                else:
+                    entry = {"role": "user", "content": msg["content"]}
+                # Identical for every perspective, so the same entry is shared
+                for history in self._history_by_perspective.values():
+                    history.append(entry)
+            self._persist_message(msg, turn_number)
+
+    def _prepare_turn_request(
+        self, persona: Persona, last_message_content: str, recent_system_messages: List[Dict[str, str]]
+    ) -> Tuple[str, str, List[Dict[str, str]]]:
+        """Build the prompt, system prompt and API history for a persona's turn."""
+        # Roles were mapped for this persona when each message was appended
+        with self._append_lock:
+            api_history = list(self._history_by_perspective[persona.name])
+
+        # Modify prompt if there are recent system messages
+        if recent_system_messages:
+            last_system = recent_system_messages[-1]
+            # Inject the system message directly into the prompt
+            prompt = f"EMERGENCY ALERT - {last_system['content']}\n\nYou MUST acknowledge and react to this situation immediately before continuing any previous conversation. How do you respond to this urgent situation?"
+        else:
+            prompt = last_message_content
+
+        # The system prompt stays byte-identical across turns so provider-side prompt caching can hit
+        system_prompt = self._get_system_prompt(persona, alert_mode=bool(recent_system_messages))
+
+        return prompt, system_prompt, api_history
+
+    def _get_system_prompt(self, persona: Persona, alert_mode: bool = False) -> str:
+        """Return the system prompt for a persona and the current theme."""
+        # The persona caches its rendered prompt per theme and drops it when edited
+        system_prompt = persona.get_system_prompt(self.conversation_theme)
+        if alert_mode:
+            # Add emphasis to system prompt
+            system_prompt += CRITICAL_INSTRUCTION_SUFFIX
+        return system_prompt
+
+    def _generate_response(
+        self, client: APIClient, prompt: str, system_prompt: str, api_history: List[Dict[str, str]]
+    ) -> str:
+        """Generate a response, answering from the response cache when it's enabled."""
+        if self.response_cache is None:
+            return client.generate_response(
+                prompt=prompt,
+                system=system_prompt,
+                conversation_history=api_history
+            )
+
+        cache_key = ResponseCache.make_key(client.name, client.model, system_prompt, prompt, api_history)
+        cached_response = self.response_cache.get(cache_key)
+        if cached_response is not None:
+            log.info(f"Response cache hit for {client.name} ({client.model})")
+            return cached_response
+
+        response = client.generate_response(
+            prompt=prompt,
+            system=system_prompt,
+            conversation_history=api_history
+        )
+        self.response_cache.put(cache_key, response)
+        return response
 
     def _clean_model_response(self, text: str) -> str:
         """Remove common UI instructions from model responses."""
-        # List of patterns to remove
-        patterns = [
-            "Click reply or enter to continue",
-            "Click reply or enter after each message",
-            "Press Enter to continue",
-            "Type your response below",
-            "Click to respond",
-            "Please respond to continue our conversation",
-            "Your turn to respond",
-            "Click below to respond"
-        ]
-        
-        # Check for each pattern case-insensitively and remove it
-        cleaned_text = text
-        for pattern in patterns:
-            # Try with variations of separators and punctuation
-            for variant in [pattern, pattern + ".", pattern + "!", pattern + ","]:
-                cleaned_text = cleaned_text.replace(variant, "")
-                cleaned_text = cleaned_text.replace(variant.lower(), "")
-                cleaned_text = cleaned_text.replace(variant.upper(), "")
-        
         # Remove any trailing whitespace, newlines, etc. that might be left
-        cleaned_text = cleaned_text.strip()
-        
-        return cleaned_text
+        low = text.lower()
+        if not any(marker in low for marker in self._QUICK_MARKERS):
+            return text.strip()
+        return self._CLEAN_RE.sub("", text).strip()
 
     def add_narrator_message(self, message: str):
         """Add a narrator message to the conversation history."""
@@ -567,9 +787,9 @@ class ChatManager:
             "persona": "Narrator", 
             "content": message
         }
-        self.conversation.append(narrator_msg)
+        self.append_message(narrator_msg)
         self._log_message(narrator_msg)
-        self.app.after(0, self.app.update_conversation_display) # Update GUI from main thread
+        self.app.post_to_ui(self.app.update_conversation_display) # Update GUI from main thread
         log.info(f"Narrator message added: {message}")
 
     def add_system_instruction(self, instruction: str):
@@ -585,11 +805,11 @@ class ChatManager:
         }
         
         # Add to conversation
-        self.conversation.append(system_msg)
+        self.append_message(system_msg)
         self._log_message(system_msg)
         
         # Update GUI
-        self.app.after(0, self.app.update_conversation_display)
+        self.app.post_to_ui(self.app.update_conversation_display)
         log.info(f"System instruction added: {instruction}")
         
         # If conversation is paused, this will be picked up when resumed
@@ -597,10 +817,13 @@ class ChatManager:
 
     def _log_message(self, msg_data: Dict[str, str]):
         """Append a message to the global log file."""
+        if self._log_fp is None:
+            return
         try:
-            with open(LOG_FILE, 'a', encoding='utf-8') as f:
-                timestamp = datetime.now().strftime('[%Y-%m-%d %H:%M:%S]')
-                f.write(f"{timestamp} {msg_data['persona']} ({msg_data['role']}): {msg_data['content']}\n")
+            timestamp = datetime.now().strftime('[%Y-%m-%d %H:%M:%S]')
+            line = f"{timestamp} {msg_data['persona']} ({msg_data['role']}): {msg_data['content']}\n"
+            with self._log_lock:
+                self._log_fp.write(line)
         except Exception as e:
             log.error(f"Failed to write to log file {LOG_FILE}: {e}")
 
@@ -608,6 +831,20 @@ class ChatManager:
 class ChatApp(tkb.Window):
     """Main application window for the chat interface using ttkbootstrap."""
 
+    # Display colors assigned to personas in order: theme color names, then fixed colors
+    PERSONA_COLORS = (
+        "success",  # Green
+        "info",     # Blue
+        "warning",  # Orange
+        "danger",   # Red
+        "primary",  # Primary
+        "#9b59b6",  # Purple
+        "#e74c3c",  # Crimson
+        "#3498db",  # Sky blue
+        "#2ecc71",  # Emerald
+        "#f39c12",  # Gold
+    )
+
     def __init__(self):
         # Initialize with a dark theme
         super().__init__(themename=DEFAULT_THEME)
@@ -619,7 +856,55 @@ class ChatApp(tkb.Window):
         
         # Initialize the chat manager
         self.chat_manager = ChatManager(self)
+
+        # The message currently being streamed and the text shown for it so far
+        self._stream_msg: Optional[Dict[str, str]] = None
+        self._stream_parts: List[str] = []
+        # Which conversation list the display shows, and how many of its messages are rendered
+        self._rendered_conversation: Optional[List[Dict[str, str]]] = None
+        self._rendered_count = 0
+        self._persona_indices: Dict[str, int] = {}
+        self._update_pending = False  # A display update is already scheduled
+        self._stop_requested = False  # Show the setup screen when the chat thread exits
+        self._chat_screen_active = False  # The conversation display exists and is shown
+        # Marks at the start of each rendered message, oldest first, for trimming the display
+        self._message_marks: deque = deque()
+        self._mark_seq = 0
+
+        # Worker threads hand UI work to the main thread through this queue
+        self.ui_queue = queue.SimpleQueue()
+        self.after(UI_QUEUE_POLL_MS, self._drain_ui_queue)
+
+        # Fetched model lists per provider, and the comboboxes waiting on in-flight fetches
+        self._model_cache: Dict[str, Tuple[float, List[str]]] = {}
+        self._model_inflight: Dict[str, List[Tuple[Any, Optional[str]]]] = {}
+        self._model_pool = ThreadPoolExecutor(max_workers=MODEL_FETCH_WORKERS, thread_name_prefix="model-fetch")
+        atexit.register(self._model_pool.shutdown, wait=False)
+
+        # Persona dialogs are built on first use and reused afterwards
+        self._add_dialog: Optional[tkb.Toplevel] = None
+        self._edit_dialog: Optional[tkb.Toplevel] = None
+        self._editing: Optional[Tuple[Persona, int]] = None  # Persona and list row being edited
+
+        # Persona edits are saved off the UI thread, shortly after the last change
+        self._save_after_id: Optional[str] = None
+        self._persona_save_seq = 0
+        self._persona_save_lock = threading.Lock()
+        # Saves get their own worker so they never queue behind slow model fetches
+        self._persona_save_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="persona-save")
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         
+        # Named fonts shared by every widget and tag that uses them
+        self._font_title = tkfont.Font(self, size=16, weight="bold")
+        self._font_medium = tkfont.Font(self, size=12)
+        self._font_conversation = tkfont.Font(self, size=11)
+        self._font_text = tkfont.Font(self, size=10)
+        self._font_name = tkfont.Font(self, size=10, weight="bold")
+
+        # Persona colors resolved against the theme once; the theme never changes at runtime
+        colors = self.style.colors
+        self._persona_colors = [c if c.startswith("#") else colors.get(c) for c in self.PERSONA_COLORS]
+
         # Load config early for model defaults
         self.app_config = load_config()
         
@@ -674,6 +959,10 @@ class ChatApp(tkb.Window):
     
     def show_setup_screen(self):
         """Show the initial setup screen for selecting personas and models."""
+        # Late updates from a still running chat thread have no display to render to
+        self._chat_screen_active = False
+        self._reset_stream_state()
+
         # Clear the main frame
         for widget in self.main_frame.winfo_children():
             widget.destroy()
@@ -687,7 +976,7 @@ class ChatApp(tkb.Window):
         title_label = tkb.Label(
             setup_frame, 
             text="AI Chat Setup", 
-            font=("-size 16 -weight bold") # ttkbootstrap font syntax
+            font=self._font_title
         )
         title_label.grid(row=0, column=0, pady=20)
         
@@ -744,8 +1033,7 @@ class ChatApp(tkb.Window):
         self.available_personas_list.pack(side=LEFT, fill=tkb.BOTH, expand=True)
         avail_scroll.config(command=self.available_personas_list.yview)
 
-        for persona in self.chat_manager.personas:
-            self.available_personas_list.insert(END, persona.name)
+        self.available_personas_list.insert(END, *[p.name for p in self.chat_manager.personas])
 
         # Management buttons
         mgmt_frame = tkb.Frame(parent)
@@ -778,57 +1066,105 @@ class ChatApp(tkb.Window):
             self.conversation_personas = [self.chat_manager.personas[0].name, self.chat_manager.personas[1].name]
         elif len(self.chat_manager.personas) == 1:
             self.conversation_personas = [self.chat_manager.personas[0].name]
+        self._conv_set = set(self.conversation_personas)  # Membership index over conversation_personas
         self._refresh_selected_personas_list()
 
     def _refresh_selected_personas_list(self):
         """Refresh the selected personas listbox."""
+        if self.selected_personas_list.get(0, END) == tuple(self.conversation_personas):
+            return
         self.selected_personas_list.delete(0, END)
-        for name in self.conversation_personas:
-            self.selected_personas_list.insert(END, name)
+        # One insert call for the whole list rather than one Tcl round-trip per name
+        self.selected_personas_list.insert(END, *self.conversation_personas)
 
     def _add_persona_to_conv(self):
         sel = self.available_personas_list.curselection()
         if not sel:
             return
         name = self.available_personas_list.get(sel[0])
-        if name in self.conversation_personas:
+        if name in self._conv_set:
             messagebox.showinfo("Info", f"{name} is already in the conversation.")
             return
         if len(self.conversation_personas) >= 10:
             messagebox.showinfo("Info", "Maximum 10 personas allowed.")
             return
         self.conversation_personas.append(name)
-        self._refresh_selected_personas_list()
+        self._conv_set.add(name)
+        self.selected_personas_list.insert(END, name)
 
     def _remove_persona_from_conv(self):
         sel = self.selected_personas_list.curselection()
         if not sel:
             return
+        self._conv_set.discard(self.conversation_personas[sel[0]])
         del self.conversation_personas[sel[0]]
-        self._refresh_selected_personas_list()
+        self.selected_personas_list.delete(sel[0])
+
+    def _swap_in_listbox(self, i: int, j: int):
+        """Move the selected persona from row i to row j, touching only that row."""
+        if self.conversation_personas[i] == self.conversation_personas[j]:
+            return # Swapping identical names changes nothing
+        self.conversation_personas[i], self.conversation_personas[j] = self.conversation_personas[j], self.conversation_personas[i]
+        name = self.selected_personas_list.get(i)
+        self.selected_personas_list.delete(i)
+        self.selected_personas_list.insert(j, name)
+        self.selected_personas_list.selection_set(j)
 
     def _move_persona_up(self):
         sel = self.selected_personas_list.curselection()
         if not sel or sel[0] == 0:
             return
-        i = sel[0]
-        self.conversation_personas[i], self.conversation_personas[i-1] = self.conversation_personas[i-1], self.conversation_personas[i]
-        self._refresh_selected_personas_list()
-        self.selected_personas_list.selection_set(i-1)
+        self._swap_in_listbox(sel[0], sel[0] - 1)
 
     def _move_persona_down(self):
         sel = self.selected_personas_list.curselection()
         if not sel or sel[0] >= len(self.conversation_personas) - 1:
             return
-        i = sel[0]
-        self.conversation_personas[i], self.conversation_personas[i+1] = self.conversation_personas[i+1], self.conversation_personas[i]
-        self._refresh_selected_personas_list()
-        self.selected_personas_list.selection_set(i+1)
+        self._swap_in_listbox(sel[0], sel[0] + 1)
     
+    def _schedule_persona_save(self, force: bool = False):
+        """Save personas after a short delay, restarting the delay on each change.
+
+        With ``force`` any pending save is written immediately on the calling thread.
+        """
+        if self._save_after_id is not None:
+            self.after_cancel(self._save_after_id)
+            self._save_after_id = None
+            if force:
+                self._persona_save_seq += 1
+                self._write_personas(self._persona_save_seq, [p.to_dict() for p in self.chat_manager.personas])
+                return
+        if not force:
+            self._save_after_id = self.after(PERSONA_SAVE_DELAY_MS, self._save_personas_in_background)
+
+    def _save_personas_in_background(self):
+        """Snapshot the personas on the UI thread and write them on the save worker."""
+        self._save_after_id = None
+        self._persona_save_seq += 1
+        personas_data = [p.to_dict() for p in self.chat_manager.personas]
+        self._persona_save_pool.submit(self._write_personas, self._persona_save_seq, personas_data)
+
+    def _write_personas(self, seq: int, personas_data: List[Dict[str, Any]]):
+        with self._persona_save_lock:
+            if seq != self._persona_save_seq:
+                return # A newer snapshot is queued behind this one
+            try:
+                self.chat_manager.write_personas(personas_data)
+            except Exception as e:
+                log.exception(f"Error saving personas: {e}")
+                self.post_to_ui(messagebox.showerror, "Error", f"Failed to save personas to {PERSONAS_FILE}: {e}")
+
+    def _on_close(self):
+        """Flush pending persona changes before the window closes."""
+        self._schedule_persona_save(force=True)
+        # Let a save that's already on the worker finish writing
+        self._persona_save_pool.shutdown(wait=True)
+        self.destroy()
+
     def update_persona_details(self, persona_name, details_widget):
         """Update the details display for a selected persona."""
         # Find the persona by name
-        persona = next((p for p in self.chat_manager.personas if p.name == persona_name), None)
+        persona = self.chat_manager.get_persona(persona_name)
         
         # Update details widget
         details_widget.config(state=NORMAL)
@@ -843,51 +1179,94 @@ class ChatApp(tkb.Window):
         
         details_widget.config(state=DISABLED)
     
-    def add_persona(self):
+    def _build_persona_dialog(self, submit_text: str, on_submit) -> tkb.Toplevel:
+        """Build a persona form dialog. It is built once and hidden, not destroyed, when closed."""
         dialog = tkb.Toplevel(self)
-        dialog.title("Add New Persona")
+        dialog.withdraw()
         dialog.geometry("500x400")
         dialog.transient(self)
-        dialog.grab_set()
 
         form_frame = tkb.Frame(dialog, padding="10")
         form_frame.pack(fill=tkb.BOTH, expand=True)
 
         tkb.Label(form_frame, text="Name:").grid(row=0, column=0, sticky="w", pady=5)
-        name_entry = tkb.Entry(form_frame, width=40)
-        name_entry.grid(row=0, column=1, sticky="ew", pady=5)
+        dialog.name_entry = tkb.Entry(form_frame, width=40)
+        dialog.name_entry.grid(row=0, column=1, sticky="ew", pady=5)
 
         tkb.Label(form_frame, text="Age:").grid(row=1, column=0, sticky="w", pady=5)
-        age_entry = tkb.Spinbox(form_frame, from_=1, to=150, width=5)
-        age_entry.grid(row=1, column=1, sticky="w", pady=5)
+        dialog.age_entry = tkb.Spinbox(form_frame, from_=1, to=150, width=5)
+        dialog.age_entry.grid(row=1, column=1, sticky="w", pady=5)
 
         tkb.Label(form_frame, text="Gender:").grid(row=2, column=0, sticky="w", pady=5)
-        gender_entry = tkb.Entry(form_frame, width=40)
-        gender_entry.grid(row=2, column=1, sticky="ew", pady=5)
+        dialog.gender_entry = tkb.Entry(form_frame, width=40)
+        dialog.gender_entry.grid(row=2, column=1, sticky="ew", pady=5)
 
         tkb.Label(form_frame, text="Personality:").grid(row=3, column=0, sticky="w", pady=5)
-        personality_text = scrolledtext.ScrolledText(form_frame, height=10, width=40)
-        personality_text.grid(row=3, column=1, sticky="ew", pady=5)
+        personality_frame = tkb.Frame(form_frame)
+        personality_frame.grid(row=3, column=1, sticky="ew", pady=5)
+        personality_scroll = tkb.Scrollbar(personality_frame)
+        personality_scroll.pack(side=RIGHT, fill=tkb.Y)
+        dialog.personality_text = tk.Text(
+            personality_frame, height=10, width=40, undo=True, maxundo=100,
+            yscrollcommand=personality_scroll.set
+        )
+        dialog.personality_text.pack(side=LEFT, fill=tkb.BOTH, expand=True)
+        personality_scroll.config(command=dialog.personality_text.yview)
+
+        def close():
+            dialog.grab_release()
+            dialog.withdraw()
+        dialog.close = close
+        dialog.protocol("WM_DELETE_WINDOW", close)
 
         button_frame = tkb.Frame(form_frame)
         button_frame.grid(row=4, column=0, columnspan=2, pady=10)
+        tkb.Button(button_frame, text=submit_text, command=on_submit, bootstyle="success").pack(side=LEFT, padx=5)
+        tkb.Button(button_frame, text="Cancel", command=close, bootstyle="secondary").pack(side=LEFT, padx=5)
+        return dialog
+
+    def _show_persona_dialog(self, dialog: tkb.Toplevel, title: str, name: str = "", age: Any = "",
+                             gender: str = "", personality: str = ""):
+        """Reset a persona dialog's fields and show it."""
+        dialog.title(title)
+        dialog.name_entry.delete(0, END)
+        dialog.name_entry.insert(0, name)
+        dialog.age_entry.set(age)
+        dialog.gender_entry.delete(0, END)
+        dialog.gender_entry.insert(0, gender)
+        dialog.personality_text.delete("1.0", END)
+        dialog.personality_text.insert("1.0", personality)
+        dialog.personality_text.edit_reset() # Don't let undo reach the previous persona's text
+        dialog.deiconify()
+        dialog.grab_set()
+        dialog.name_entry.focus_set()
+
+    @staticmethod
+    def _read_persona_dialog(dialog: tkb.Toplevel) -> Tuple[str, int, str, str]:
+        """Return the name, age, gender and personality entered in a persona dialog."""
+        return (
+            dialog.name_entry.get().strip(),
+            int(dialog.age_entry.get()),
+            dialog.gender_entry.get().strip(),
+            dialog.personality_text.get("1.0", END).strip(),
+        )
 
-        def submit():
-            name = name_entry.get().strip()
-            age = int(age_entry.get())
-            gender = gender_entry.get().strip()
-            personality = personality_text.get("1.0", END).strip()
-            if name and gender and personality:
-                new_persona = Persona(name, personality, age, gender)
-                self.chat_manager.personas.append(new_persona)
-                self.chat_manager.save_personas()
-                self.available_personas_list.insert(END, name)
-                dialog.destroy()
-            else:
-                messagebox.showerror("Error", "Please fill in all fields.", parent=dialog)
-
-        tkb.Button(button_frame, text="Add", command=submit, bootstyle="success").pack(side=LEFT, padx=5)
-        tkb.Button(button_frame, text="Cancel", command=dialog.destroy, bootstyle="secondary").pack(side=LEFT, padx=5)
+    def add_persona(self):
+        if self._add_dialog is None:
+            self._add_dialog = self._build_persona_dialog("Add", self._submit_add_persona)
+        self._show_persona_dialog(self._add_dialog, "Add New Persona")
+
+    def _submit_add_persona(self):
+        dialog = self._add_dialog
+        name, age, gender, personality = self._read_persona_dialog(dialog)
+        if name and gender and personality:
+            new_persona = Persona(name, personality, age, gender)
+            self.chat_manager.add_persona(new_persona)
+            self._schedule_persona_save()
+            self.available_personas_list.insert(END, name)
+            dialog.close()
+        else:
+            messagebox.showerror("Error", "Please fill in all fields.", parent=dialog)
 
     def edit_persona(self):
         sel = self.available_personas_list.curselection()
@@ -895,68 +1274,44 @@ class ChatApp(tkb.Window):
             messagebox.showinfo("Info", "Please select a persona from the Available list to edit.")
             return
         selected_name = self.available_personas_list.get(sel[0])
-        persona = next((p for p in self.chat_manager.personas if p.name == selected_name), None)
+        persona = self.chat_manager.get_persona(selected_name)
         if not persona:
             return
 
-        dialog = tkb.Toplevel(self)
-        dialog.title(f"Edit Persona: {persona.name}")
-        dialog.geometry("500x400")
-        dialog.transient(self)
-        dialog.grab_set()
-
-        form_frame = tkb.Frame(dialog, padding="10")
-        form_frame.pack(fill=tkb.BOTH, expand=True)
-
-        tkb.Label(form_frame, text="Name:").grid(row=0, column=0, sticky="w", pady=5)
-        name_entry = tkb.Entry(form_frame, width=40)
-        name_entry.insert(0, persona.name)
-        name_entry.grid(row=0, column=1, sticky="ew", pady=5)
-
-        tkb.Label(form_frame, text="Age:").grid(row=1, column=0, sticky="w", pady=5)
-        age_entry = tkb.Spinbox(form_frame, from_=1, to=150, width=5)
-        age_entry.set(persona.age)
-        age_entry.grid(row=1, column=1, sticky="w", pady=5)
-
-        tkb.Label(form_frame, text="Gender:").grid(row=2, column=0, sticky="w", pady=5)
-        gender_entry = tkb.Entry(form_frame, width=40)
-        gender_entry.insert(0, persona.gender)
-        gender_entry.grid(row=2, column=1, sticky="ew", pady=5)
-
-        tkb.Label(form_frame, text="Personality:").grid(row=3, column=0, sticky="w", pady=5)
-        personality_text = scrolledtext.ScrolledText(form_frame, height=10, width=40)
-        personality_text.insert("1.0", persona.personality)
-        personality_text.grid(row=3, column=1, sticky="ew", pady=5)
-
-        def submit():
-            old_name = persona.name
-            name = name_entry.get().strip()
-            age = int(age_entry.get())
-            gender = gender_entry.get().strip()
-            personality = personality_text.get("1.0", END).strip()
-            if name and gender and personality:
-                persona.name = name
-                persona.age = age
-                persona.gender = gender
-                persona.personality = personality
-                self.chat_manager.save_personas()
-                # Update available list
-                self.available_personas_list.delete(0, END)
-                for p in self.chat_manager.personas:
-                    self.available_personas_list.insert(END, p.name)
-                # Update conversation list if name changed
-                if old_name != name and old_name in self.conversation_personas:
-                    idx = self.conversation_personas.index(old_name)
-                    self.conversation_personas[idx] = name
-                    self._refresh_selected_personas_list()
-                dialog.destroy()
-            else:
-                messagebox.showerror("Error", "Please fill in all fields.", parent=dialog)
+        # The dialog is shared between edits, so remember which persona and row this one is for
+        self._editing = (persona, sel[0])
+        if self._edit_dialog is None:
+            self._edit_dialog = self._build_persona_dialog("Save", self._submit_edit_persona)
+        self._show_persona_dialog(
+            self._edit_dialog, f"Edit Persona: {persona.name}",
+            persona.name, persona.age, persona.gender, persona.personality
+        )
 
-        button_frame = tkb.Frame(form_frame)
-        button_frame.grid(row=4, column=0, columnspan=2, pady=10)
-        tkb.Button(button_frame, text="Save", command=submit, bootstyle="success").pack(side=LEFT, padx=5)
-        tkb.Button(button_frame, text="Cancel", command=dialog.destroy, bootstyle="secondary").pack(side=LEFT, padx=5)
+    def _submit_edit_persona(self):
+        dialog = self._edit_dialog
+        persona, row = self._editing
+        old_name = persona.name
+        name, age, gender, personality = self._read_persona_dialog(dialog)
+        if name and gender and personality:
+            self.chat_manager.rename_persona(persona, name)
+            persona.age = age
+            persona.gender = gender
+            persona.personality = personality
+            self._schedule_persona_save()
+            # Update available list
+            self.available_personas_list.delete(row)
+            self.available_personas_list.insert(row, name)
+            # Update conversation list if name changed
+            if old_name != name and old_name in self._conv_set:
+                idx = self.conversation_personas.index(old_name)
+                self.conversation_personas[idx] = name
+                self._conv_set.discard(old_name)
+                self._conv_set.add(name)
+                self.selected_personas_list.delete(idx)
+                self.selected_personas_list.insert(idx, name)
+            dialog.close()
+        else:
+            messagebox.showerror("Error", "Please fill in all fields.", parent=dialog)
 
     def delete_persona(self):
         sel = self.available_personas_list.curselection()
@@ -965,16 +1320,21 @@ class ChatApp(tkb.Window):
             return
         selected_name = self.available_personas_list.get(sel[0])
         if messagebox.askyesno("Confirm", f"Are you sure you want to delete {selected_name}?"):
-            self.chat_manager.personas = [p for p in self.chat_manager.personas if p.name != selected_name]
-            self.chat_manager.save_personas()
+            self.chat_manager.remove_persona(selected_name)
+            self._schedule_persona_save()
             self.available_personas_list.delete(sel[0])
-            if selected_name in self.conversation_personas:
-                self.conversation_personas.remove(selected_name)
-                self._refresh_selected_personas_list()
+            if selected_name in self._conv_set:
+                idx = self.conversation_personas.index(selected_name)
+                del self.conversation_personas[idx]
+                self._conv_set.discard(selected_name)
+                self.selected_personas_list.delete(idx)
     
     def setup_models_tab(self, parent):
         """Set up the models selection tab for multiple personas."""
         self.persona_model_config = {}
+        self.persona_model_widgets: Dict[str, tkb.LabelFrame] = {}  # Frame per persona, in display order
+        self._models_placeholder: Optional[tkb.Label] = None
+        self._var_pool: Dict[Tuple[str, str], tk.StringVar] = {}  # Provider/model vars per persona
         self.models_parent = parent
 
         # Scrollable area for persona model configs
@@ -995,49 +1355,102 @@ class ChatApp(tkb.Window):
         self._rebuild_models_tab()
 
     def _rebuild_models_tab(self):
-        """Rebuild model selection widgets for each selected persona."""
-        for w in self.models_inner_frame.winfo_children():
-            w.destroy()
+        """Sync the model selection widgets with the selected personas.
+
+        Frames are kept per persona, so only personas added or removed since the
+        last sync have widgets created or destroyed.
+        """
+        if self._models_placeholder is not None:
+            self._models_placeholder.destroy()
+            self._models_placeholder = None
+
+        selected = set(self.conversation_personas)
+        for pname in [p for p in self.persona_model_widgets if p not in selected]:
+            self.persona_model_widgets.pop(pname).destroy()
+            # Drop the persona's Tcl variables along with its widgets
+            self._var_pool.pop(("provider", pname), None)
+            self._var_pool.pop(("model", pname), None)
 
         if not self.conversation_personas:
-            tkb.Label(self.models_inner_frame, text="Select personas first.", font=("-size 12")).pack(padx=20, pady=20)
+            self._models_placeholder = tkb.Label(self.models_inner_frame, text="Select personas first.", font=self._font_medium)
+            self._models_placeholder.pack(padx=20, pady=20)
             return
 
         for pname in self.conversation_personas:
-            frame = tkb.LabelFrame(self.models_inner_frame, text=f"{pname}", padding="10")
-            frame.pack(fill="x", padx=10, pady=5)
-
-            tkb.Label(frame, text="Provider:").grid(row=0, column=0, padx=5, pady=3, sticky="w")
-            prov_var = tkb.StringVar(value="ollama")
-            prov_combo = tkb.Combobox(frame, textvariable=prov_var, values=list(self.chat_manager.api_clients.keys()), state="readonly")
-            prov_combo.grid(row=0, column=1, padx=5, pady=3, sticky="ew")
-
-            tkb.Label(frame, text="Model:").grid(row=1, column=0, padx=5, pady=3, sticky="w")
-            model_var = tkb.StringVar()
-            model_combo = tkb.Combobox(frame, textvariable=model_var)
-            model_combo.grid(row=1, column=1, padx=5, pady=3, sticky="ew")
-
-            tkb.Button(frame, text="Refresh", command=lambda pv=prov_var, mc=model_combo: self.refresh_models(pv.get(), mc), bootstyle="info-outline").grid(row=2, column=0, columnspan=2, padx=5, pady=3)
-
-            # Restore previous config if exists
-            if pname in self.persona_model_config:
-                prev_prov, prev_model = self.persona_model_config[pname]
-                prov_var.set(prev_prov)
-                model_var.set(prev_model)
-            else:
-                self.persona_model_config[pname] = ("ollama", "")
+            if pname not in self.persona_model_widgets:
+                self.persona_model_widgets[pname] = self._build_persona_model_frame(pname)
+
+        # Repack only if the order changed; new frames were packed at the end
+        if list(self.persona_model_widgets) != self.conversation_personas:
+            for pname in self.conversation_personas:
+                self.persona_model_widgets[pname].pack_forget()
+            for pname in self.conversation_personas:
+                self.persona_model_widgets[pname].pack(fill="x", padx=10, pady=5)
+            self.persona_model_widgets = {p: self.persona_model_widgets[p] for p in self.conversation_personas}
+
+    def _pooled_var(self, kind: str, pname: str, value: str = "") -> tk.StringVar:
+        """Return the StringVar of the given kind for a persona, creating it on first use."""
+        var = self._var_pool.get((kind, pname))
+        if var is None:
+            var = self._var_pool[(kind, pname)] = tk.StringVar(self, value=value)
+        return var
+
+    def _build_persona_model_frame(self, pname):
+        """Create the provider and model selectors for one persona."""
+        frame = tkb.LabelFrame(self.models_inner_frame, text=f"{pname}", padding="10")
+        frame.pack(fill="x", padx=10, pady=5)
+
+        tkb.Label(frame, text="Provider:").grid(row=0, column=0, padx=5, pady=3, sticky="w")
+        prov_var = self._pooled_var("provider", pname, "ollama")
+        prov_combo = tkb.Combobox(frame, textvariable=prov_var, values=list(self.chat_manager.api_clients.keys()), state="readonly")
+        prov_combo.grid(row=0, column=1, padx=5, pady=3, sticky="ew")
+
+        tkb.Label(frame, text="Model:").grid(row=1, column=0, padx=5, pady=3, sticky="w")
+        model_var = self._pooled_var("model", pname)
+        model_combo = tkb.Combobox(frame, textvariable=model_var)
+        model_combo.grid(row=1, column=1, padx=5, pady=3, sticky="ew")
+
+        tkb.Button(frame, text="Refresh", command=lambda pv=prov_var, mc=model_combo: self.refresh_models(pv.get(), mc, force=True), bootstyle="info-outline").grid(row=2, column=0, columnspan=2, padx=5, pady=3)
+
+        # Restore previous config if exists
+        if pname in self.persona_model_config:
+            prev_prov, prev_model = self.persona_model_config[pname]
+            prov_var.set(prev_prov)
+            model_var.set(prev_model)
+        else:
+            self.persona_model_config[pname] = ("ollama", "")
+
+        # Bind changes
+        prov_combo.bind("<<ComboboxSelected>>", lambda e, pv=prov_var, mc=model_combo: self.refresh_models(pv.get(), mc))
+        model_combo.bind("<<ComboboxSelected>>", lambda e, pn=pname, pv=prov_var, mv=model_var: self._save_persona_model(pn, pv.get(), mv.get()))
 
-            # Bind changes
-            prov_combo.bind("<<ComboboxSelected>>", lambda e, pv=prov_var, mc=model_combo: self.refresh_models(pv.get(), mc))
-            model_combo.bind("<<ComboboxSelected>>", lambda e, pn=pname, pv=prov_var, mv=model_var: self._save_persona_model(pn, pv.get(), mv.get()))
+        # Fetch the model list only once the frame is shown or the combobox is clicked
+        model_combo['values'] = ["Click to load..."]
+        if not model_var.get():
+            model_combo.current(0)
+        loaded = False
 
+        def load_models(event=None):
+            nonlocal loaded
+            if loaded:
+                return
+            loaded = True
+            frame.unbind("<Map>")
             self.refresh_models(prov_var.get(), model_combo)
 
+        frame.bind("<Map>", load_models)
+        model_combo.bind("<Button-1>", load_models, add="+")
+        return frame
+
     def _save_persona_model(self, persona_name, provider, model):
         self.persona_model_config[persona_name] = (provider, model)
     
-    def refresh_models(self, provider_name, model_combo, saved_model=None):
-        """Refresh the list of available models for a provider."""
+    def refresh_models(self, provider_name, model_combo, saved_model=None, force=False):
+        """Refresh the list of available models for a provider.
+
+        Provider changes and startup reuse a recently fetched list; ``force`` (the Refresh
+        button) always fetches it again.
+        """
         provider_key = provider_name.lower()
         providers_requiring_key = ["openrouter", "openai"]
         
@@ -1071,22 +1484,47 @@ class ChatApp(tkb.Window):
                 model_combo.current(0)
                 return
         
+        # Reuse a recently fetched list for this provider
+        cached = None if force else self._model_cache.get(provider_key)
+        if cached is not None and time.monotonic() - cached[0] < MODEL_LIST_CACHE_TTL:
+            self._update_model_combo(model_combo, cached[1], saved_model)
+            return
+
+        # If a fetch for this provider is already running, wait for its result instead
+        waiters = self._model_inflight.get(provider_key)
+        if waiters is not None:
+            waiters.append((model_combo, saved_model))
+            return
+        self._model_inflight[provider_key] = [(model_combo, saved_model)]
+
         # Use a thread to avoid blocking the UI
         def fetch_models():
             try:
                 log.info(f"Getting models from {provider_name}...")
                 models = client.get_available_models()
                 
-                # Update the combobox in the main thread
-                self.after(0, lambda: self._update_model_combo(model_combo, models, saved_model))
+                # Update the comboboxes in the main thread
+                self.post_to_ui(self._finish_model_fetch, provider_key, models, None)
             except Exception as e:
                 log.exception(f"Error fetching models: {str(e)}")
-                self.after(0, lambda: self._show_model_error(model_combo, str(e)))
+                self.post_to_ui(self._finish_model_fetch, provider_key, None, str(e))
         
-        threading.Thread(target=fetch_models, daemon=True).start()
+        self._model_pool.submit(fetch_models)
+
+    def _finish_model_fetch(self, provider_key, models, error_message):
+        """Hand a finished model fetch to every combobox waiting on it."""
+        waiters = self._model_inflight.pop(provider_key, [])
+        if error_message is not None:
+            self._show_model_error([combo for combo, _ in waiters], error_message)
+            return
+        self._model_cache[provider_key] = (time.monotonic(), models)
+        for model_combo, saved_model in waiters:
+            self._update_model_combo(model_combo, models, saved_model)
     
     def _update_model_combo(self, model_combo, models, saved_model=None):
         """Update the model combobox with fetched models."""
+        if not model_combo.winfo_exists():
+            return # Rebuilt while the models were loading
         if not models:
             model_combo['values'] = ["No models found"]
             model_combo.current(0)
@@ -1100,10 +1538,12 @@ class ChatApp(tkb.Window):
         else:
             model_combo.current(0)
     
-    def _show_model_error(self, model_combo, error_message):
-        """Show error in model combobox."""
-        model_combo['values'] = [f"Error: {error_message}"]
-        model_combo.current(0)
+    def _show_model_error(self, model_combos, error_message):
+        """Show error in the model comboboxes."""
+        for model_combo in model_combos:
+            if model_combo.winfo_exists():
+                model_combo['values'] = [f"Error: {error_message}"]
+                model_combo.current(0)
         messagebox.showerror("Error", f"Failed to get models: {error_message}")
     
     def setup_options_tab(self, parent):
@@ -1158,7 +1598,7 @@ class ChatApp(tkb.Window):
             return False
 
         for pname, (provider, model) in self.persona_model_config.items():
-            if not model or model.startswith("Error") or model in ("No models found", "Loading...", "Enter API key first"):
+            if not model or model.startswith("Error") or model in ("No models found", "Loading...", "Click to load...", "Enter API key first"):
                 messagebox.showerror("Error", f"Please select a valid model for {pname}.")
                 return False
 
@@ -1167,30 +1607,49 @@ class ChatApp(tkb.Window):
     def setup_chat_manager(self):
         """Set up the chat manager with the selected options."""
         providers_requiring_key = ["openrouter", "openai"]
+        # Resolved once up front; each keyed client's headers are only updated once
+        api_keys = {k: self.app_config.get(f"{k}_api_key", "") for k in providers_requiring_key}
+        keyed_clients = set()
+        clients_by_model: Dict[Tuple[str, str], APIClient] = {}
+        used_providers = set()
 
         selected_personas = []
         selected_clients = []
         selected_models = []
 
         for pname in self.conversation_personas:
-            persona = next((p for p in self.chat_manager.personas if p.name == pname), None)
+            persona = self.chat_manager.get_persona(pname)
             if persona:
                 selected_personas.append(persona)
 
             provider_key, model = self.persona_model_config[pname]
-            client = self.chat_manager.api_clients[provider_key.lower()]
+            provider_key = provider_key.lower()
+            client = self.chat_manager.api_clients[provider_key]
 
-            if provider_key.lower() in providers_requiring_key:
-                config_key = f"{provider_key.lower()}_api_key"
-                api_key = self.app_config.get(config_key, "")
-                client.api_key = api_key
+            if provider_key in api_keys and provider_key not in keyed_clients:
+                client.api_key = api_keys[provider_key]
                 client.update_headers()
+                keyed_clients.add(provider_key)
 
-            client.set_model(model)
+            # Personas on the same provider and model share a client. A different model on an
+            # already used provider gets its own copy, otherwise the last set_model would win.
+            shared = clients_by_model.get((provider_key, model))
+            if shared is not None:
+                client = shared
+            else:
+                if provider_key in used_providers:
+                    client = copy.copy(client)
+                client.set_model(model)
+                clients_by_model[(provider_key, model)] = client
+                used_providers.add(provider_key)
             selected_clients.append(client)
             selected_models.append(model)
 
         self.chat_manager.selected_personas = selected_personas
+        # Display tag index per persona name; the first persona wins if names repeat
+        self._persona_indices = {}
+        for i, persona in enumerate(selected_personas):
+            self._persona_indices.setdefault(persona.name, i)
         self.chat_manager.selected_clients = selected_clients
         self.chat_manager.selected_models = selected_models
         self.chat_manager.max_turns = self.max_turns_var.get()
@@ -1240,6 +1699,7 @@ class ChatApp(tkb.Window):
 
         self.search_matches = []
         self.current_search_index = -1
+        self._current_match_span: Optional[Tuple[str, str]] = None
 
         # Conversation text area with custom styling
         self.conversation_display = scrolledtext.ScrolledText(
@@ -1247,10 +1707,16 @@ class ChatApp(tkb.Window):
             wrap=WORD,
             width=80,
             height=20,
-            font=("-size 11"), relief=FLAT, borderwidth=0
+            font=self._font_conversation, relief=FLAT, borderwidth=0
         )
         self.conversation_display.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
         self.conversation_display.config(state=DISABLED)
+        self._rendered_conversation = None # The new widget starts empty
+        self._rendered_count = 0
+        self._message_marks.clear()
+        # The personas are fixed for the conversation, so tags are configured once here
+        self._configure_display_tags()
+        self._chat_screen_active = True
 
         # Configure search highlight tags
         self.conversation_display.tag_configure("search_highlight", background="yellow", foreground="black")
@@ -1264,7 +1730,7 @@ class ChatApp(tkb.Window):
             relief=SUNKEN, 
             anchor=W,
             padding=5,
-            font=("-size 10")
+            font=self._font_text
         )
         status_bar.grid(row=1, column=0, sticky="ew", padx=5, pady=2)
         
@@ -1315,69 +1781,241 @@ class ChatApp(tkb.Window):
         # Start the conversation
         self.chat_manager.start_conversation(self.topic_var.get())
     
-    def update_conversation_display(self, is_streaming: bool = False):
-        """Update the conversation display with the current conversation."""
+    def update_conversation_display(self):
+        """Add messages appended to the conversation since the last update to the display.
+
+        Calls made before the pending render runs are folded into it.
+        """
+        if self._update_pending or not self._chat_screen_active:
+            return
         try:
-            def perform_update():
-                self.conversation_display.config(state=NORMAL)
-                self.conversation_display.delete(1.0, END)
-
-                # Configure tags dynamically for all personas
-                style = tkb.Style.get_instance()
-                persona_colors = [
-                    style.colors.success,  # Green
-                    style.colors.info,     # Blue
-                    style.colors.warning,  # Orange
-                    style.colors.danger,   # Red
-                    style.colors.primary,  # Primary
-                    "#9b59b6",  # Purple
-                    "#e74c3c",  # Crimson
-                    "#3498db",  # Sky blue
-                    "#2ecc71",  # Emerald
-                    "#f39c12",  # Gold
-                ]
+            if self.winfo_exists():
+                self._update_pending = True
+                self.after_idle(self._do_update_conversation_display)
 
-                self.conversation_display.tag_configure("system_name", foreground=style.colors.secondary, font=("-size", 10, "-weight", "bold"))
-                self.conversation_display.tag_configure("system_text", foreground=style.colors.secondary, font=("-size", 10))
+        except Exception as e:
+            log.exception("Error updating conversation display")
+            self.after_idle(lambda: self.update_status(f"Error updating display: {str(e)}"))
 
-                for idx in range(len(self.chat_manager.selected_personas)):
-                    color = persona_colors[idx % len(persona_colors)]
-                    self.conversation_display.tag_configure(f"p{idx}_name", foreground=color, font=("-size", 10, "-weight", "bold"))
-                    self.conversation_display.tag_configure(f"p{idx}_text", foreground=color, font=("-size", 10))
+    def _do_update_conversation_display(self):
+        """Run the coalesced display update."""
+        self._update_pending = False
+        if self._chat_screen_active:
+            self._render_new_messages()
+
+    def _configure_display_tags(self):
+        """Configure the name and text tags for system messages and each persona."""
+        colors = self.style.colors  # Style created once by tkb.Window
+        self.conversation_display.tag_configure("system_name", foreground=colors.secondary, font=self._font_name)
+        self.conversation_display.tag_configure("system_text", foreground=colors.secondary, font=self._font_text)
+
+        for idx in range(len(self.chat_manager.selected_personas)):
+            color = self._persona_colors[idx % len(self._persona_colors)]
+            self.conversation_display.tag_configure(f"p{idx}_name", foreground=color, font=self._font_name)
+            self.conversation_display.tag_configure(f"p{idx}_text", foreground=color, font=self._font_text)
+
+    def _mark_message_start(self, index: str):
+        """Record where a rendered message starts so old messages can be trimmed later."""
+        self._mark_seq += 1
+        mark = f"msg{self._mark_seq}"
+        self.conversation_display.mark_set(mark, "end-1c" if index == END else index)
+        self.conversation_display.mark_gravity(mark, LEFT) # Stay in front of the message's text
+        self._message_marks.append(mark)
+
+    def _trim_display(self):
+        """Delete the oldest messages from the display beyond MAX_RENDERED_MESSAGES.
+
+        The full conversation is kept in the chat manager; only the widget is trimmed.
+        """
+        excess = len(self._message_marks) - MAX_RENDERED_MESSAGES
+        if excess <= 0:
+            return
+        dropped = [self._message_marks.popleft() for _ in range(excess)]
+        self.conversation_display.delete("1.0", self._message_marks[0])
+        self.conversation_display.mark_unset(*dropped)
 
-                # Build and insert text
-                for i, msg in enumerate(self.chat_manager.conversation):
-                    is_last_message = i == len(self.chat_manager.conversation) - 1
+    def _is_scrolled_to_bottom(self) -> bool:
+        """Whether the end of the conversation is in view, so new text should scroll into view."""
+        return self.conversation_display.yview()[1] >= 0.999
 
-                    if msg["role"] in ("system", "narrator"):
-                        self.conversation_display.insert(END, f"\n{msg['persona']}: ", "system_name")
-                        self.conversation_display.insert(END, f"{msg['content']}\n", "system_text")
-                    else:
-                        # Find persona index
-                        pidx = 0
-                        for j, p in enumerate(self.chat_manager.selected_personas):
-                            if msg["persona"] == p.name:
-                                pidx = j
-                                break
+    def _insert_messages(self, index: str, messages: List[Dict[str, str]]):
+        """Insert messages with their name and text tags at the given index in one Text call.
 
-                        self.conversation_display.insert(END, f"\n{msg['persona']}: ", f"p{pidx}_name")
+        Each message ends with a newline, so the next one starts at column 0 of the
+        following line; the start marks are set from that after the insert.
+        """
+        if not messages:
+            return
+        display = self.conversation_display
+        line, col = map(int, display.index("end-1c" if index == END else index).split("."))
+        starts = []
+        chunks = []
+        for msg in messages:
+            if msg["role"] in ("system", "narrator"):
+                name_tag, text_tag = "system_name", "system_text"
+            else:
+                pidx = self._persona_index(msg["persona"])
+                name_tag, text_tag = f"p{pidx}_name", f"p{pidx}_text"
+            name = f"\n{msg['persona']}: "
+            text = f"{msg['content']}\n"
+            starts.append(f"{line}.{col}")
+            line += name.count("\n") + text.count("\n")
+            col = 0
+            chunks.extend((name, name_tag, text, text_tag))
+        display.insert(index, *chunks)
+        for start in starts:
+            self._mark_message_start(start)
+
+    def _render_new_messages(self):
+        """Insert only the messages that haven't been rendered yet.
+
+        While a message is streaming its text sits at the end of the display, so new
+        messages go in front of it. The streaming message itself is already shown.
+        """
+        conversation = self.chat_manager.conversation
+        if conversation is not self._rendered_conversation:
+            self.rebuild_conversation_display() # A new conversation was started
+            return
+        if self._rendered_count >= len(conversation):
+            return
 
-                        content = msg['content']
-                        if is_streaming and is_last_message:
-                            content += "▌"
+        index = "stream_head" if self._stream_msg is not None else END
+        follow = self._is_scrolled_to_bottom()
+        self.conversation_display.config(state=NORMAL)
+        self._insert_messages(index, [msg for msg in conversation[self._rendered_count:]
+                                      if msg is not self._stream_msg])
+        self._rendered_count = len(conversation)
+        self._trim_display()
+        if follow:
+            self.conversation_display.see(END)
+        self.conversation_display.config(state=DISABLED)
 
-                        self.conversation_display.insert(END, f"{content}\n", f"p{pidx}_text")
+    def rebuild_conversation_display(self):
+        """Clear the display and render the whole conversation again."""
+        conversation = self.chat_manager.conversation
+        self.conversation_display.config(state=NORMAL)
+        self.conversation_display.delete(1.0, END)
+        if self._message_marks:
+            self.conversation_display.mark_unset(*self._message_marks)
+            self._message_marks.clear()
+
+        # Only the most recent messages are rendered
+        self._insert_messages(END, [msg for msg in conversation[-MAX_RENDERED_MESSAGES:]
+                                    if msg is not self._stream_msg])
+
+        # A streaming message is shown last, after everything already in the conversation
+        if self._stream_msg is not None:
+            self._insert_stream_tail(self._stream_msg["persona"], "".join(self._stream_parts))
+
+        self._rendered_conversation = conversation
+        self._rendered_count = len(conversation)
+        self.conversation_display.see(END)
+        self.conversation_display.config(state=DISABLED)
+    
+    def post_to_ui(self, func, *args):
+        """Queue a call to run on the Tk main thread; safe to use from worker threads."""
+        self.ui_queue.put((func, args))
 
-                self.conversation_display.see(END)
-                self.conversation_display.config(state=DISABLED)
+    def _drain_ui_queue(self):
+        """Run queued UI calls, then poll again."""
+        for _ in range(UI_QUEUE_MAX_BATCH):
+            try:
+                func, args = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception:
+                log.exception("Error running queued UI update")
+        self.after(UI_QUEUE_POLL_MS, self._drain_ui_queue)
+
+    def _persona_index(self, persona_name: str) -> int:
+        """Position of a persona in the conversation, used to pick its display tags."""
+        return self._persona_indices.get(persona_name, 0)
+
+    def _insert_stream_tail(self, persona_name: str, text: str):
+        """Insert a streaming message at the end of the display, followed by a cursor.
+
+        The ``stream_start`` and ``stream_end`` marks bracket the streamed text so
+        chunks can be inserted before the cursor without redrawing the display.
+        """
+        display = self.conversation_display
+        tag = f"p{self._persona_index(persona_name)}_text"
+        head = display.index("end-1c")
+        display.insert(END, f"\n{persona_name}: ", tag.replace("_text", "_name"))
+        start = display.index("end-1c")
+        display.insert(END, text, tag)
+        end = display.index("end-1c")
+        display.insert(END, "▌\n", tag)
+
+        # Marks are placed after inserting so insertions at END don't carry them along.
+        # Messages added while streaming are inserted before stream_head.
+        display.mark_set("stream_head", head)
+        display.mark_gravity("stream_head", RIGHT)
+        display.mark_set("stream_start", start)
+        display.mark_gravity("stream_start", LEFT)
+        display.mark_set("stream_end", end)
+        display.mark_gravity("stream_end", RIGHT)
+
+    def _reset_stream_state(self, msg: Optional[Dict[str, str]] = None):
+        """Start tracking a new streaming message, or stop tracking one."""
+        self._stream_msg = msg
+        self._stream_parts = []
+
+    def begin_stream_message(self, msg: Dict[str, str]):
+        """Show a new, still empty streaming message at the end of the display."""
+        if not self._chat_screen_active:
+            return
+        self._reset_stream_state(msg)
+        follow = self._is_scrolled_to_bottom()
+        self.conversation_display.config(state=NORMAL)
+        self._insert_stream_tail(msg["persona"], "")
+        if follow:
+            self.conversation_display.see(END)
+        self.conversation_display.config(state=DISABLED)
 
-            if self.winfo_exists():
-                self.after_idle(perform_update)
+    def append_stream_text(self, text: str):
+        """Insert newly streamed text before the cursor.
+
+        The conversation thread already batches chunks to at most one call per
+        STREAM_REDRAW_INTERVAL, so the text is inserted straight away.
+        """
+        if self._stream_msg is None:
+            return
+        self._stream_parts.append(text)
+        tag = f"p{self._persona_index(self._stream_msg['persona'])}_text"
+        follow = self._is_scrolled_to_bottom()
+        self.conversation_display.config(state=NORMAL)
+        self.conversation_display.insert("stream_end", text, tag)
+        if follow:
+            self.conversation_display.see(END)
+        self.conversation_display.config(state=DISABLED)
+
+    def end_stream_message(self, content: str):
+        """Replace the streamed text and cursor with the message's final, cleaned content."""
+        if self._stream_msg is None:
+            return
+        # Render anything appended before the streamed message, and count the message as rendered
+        self._render_new_messages()
+        tag = f"p{self._persona_index(self._stream_msg['persona'])}_text"
+        self._reset_stream_state()
+        follow = self._is_scrolled_to_bottom()
+        self.conversation_display.config(state=NORMAL)
+        self._mark_message_start("stream_head")
+        self.conversation_display.delete("stream_start", "stream_end + 1c")
+        self.conversation_display.insert("stream_start", content, tag)
+        self._trim_display()
+        if follow:
+            self.conversation_display.see(END)
+        self.conversation_display.config(state=DISABLED)
+
+    def discard_stream_message(self):
+        """Remove a failed streaming message from the display."""
+        if not self._chat_screen_active:
+            return
+        self._reset_stream_state()
+        self.rebuild_conversation_display()
 
-        except Exception as e:
-            log.exception("Error updating conversation display")
-            self.after_idle(lambda: self.update_status(f"Error updating display: {str(e)}"))
-    
     def update_status(self, message: str):
         """Update the status bar with a message."""
         try:
@@ -1421,19 +2059,16 @@ class ChatApp(tkb.Window):
         # Disable controls until fully stopped
         self.enable_controls(False)
         
-        # Wait for the chat thread to finish
-        if self.chat_manager.chat_thread and self.chat_manager.chat_thread.is_alive():
-            self.after(100, self.check_thread_stopped)
-        else:
+        # The chat thread signals when it finishes; show the setup screen then
+        if self.chat_manager.stopped_event.is_set():
             self.show_setup_screen()
-    
-    def check_thread_stopped(self):
-        """Check if the chat thread has stopped."""
-        if self.chat_manager.chat_thread and self.chat_manager.chat_thread.is_alive():
-            # Still running, check again later
-            self.after(100, self.check_thread_stopped)
         else:
-            # Thread stopped, show setup screen
+            self._stop_requested = True
+
+    def on_conversation_stopped(self):
+        """Called on the UI thread once the conversation loop has exited."""
+        if self._stop_requested:
+            self._stop_requested = False
             self.show_setup_screen()
     
     def enable_controls(self, enabled: bool):
@@ -1472,7 +2107,7 @@ class ChatApp(tkb.Window):
             }
             
             # Add to conversation
-            self.chat_manager.conversation.append(system_msg)
+            self.chat_manager.append_message(system_msg)
             self.chat_manager._log_message(system_msg)
             
             # Update GUI
@@ -1512,7 +2147,7 @@ class ChatApp(tkb.Window):
                 }
                 
                 # Add to conversation
-                self.chat_manager.conversation.append(system_msg)
+                self.chat_manager.append_message(system_msg)
                 self.chat_manager._log_message(system_msg)
                 
                 # Update GUI
@@ -1715,28 +2350,44 @@ class ChatApp(tkb.Window):
         self.conversation_display.tag_remove("current_match", "1.0", END)
         self.search_matches = []
         self.current_search_index = -1
+        self._current_match_span = None
 
-        use_regex = self.regex_var.get()
-        case_sensitive = self.case_sensitive_var.get()
-
-        self.conversation_display.config(state=NORMAL)
-        start_pos = "1.0"
-
-        while True:
-            pos = self.conversation_display.search(
-                query, start_pos, END,
-                regexp=use_regex,
-                nocase=not case_sensitive
-            )
-            if not pos:
-                break
+        # Compile once and sweep the text in a single pass rather than one widget search per match
+        flags = 0 if self.case_sensitive_var.get() else re.IGNORECASE
+        try:
+            pattern = re.compile(query if self.regex_var.get() else re.escape(query), flags)
+        except re.error as e:
+            self.search_result_label.config(text=f"Invalid regex: {e}")
+            return
 
-            end_pos = f"{pos}+{len(query)}c"
-            self.search_matches.append((pos, end_pos))
-            self.conversation_display.tag_add("search_highlight", pos, end_pos)
-            start_pos = end_pos
+        text = self.conversation_display.get("1.0", END)
+        # Offset of the first character of each line, for turning offsets into line.column indices
+        line_starts = [0]
+        line_starts.extend(m.end() for m in re.finditer("\n", text))
+
+        # Tcl 8.6 stores astral characters as surrogate pairs, so each takes two index
+        # units there; ask Tcl rather than assume, as later versions count them as one
+        extra_width = 0
+        if _ASTRAL_RE.search(text):
+            extra_width = int(self.tk.call("string", "length", "\U0001F600")) - 1
+
+        def to_index(offset: int) -> str:
+            line = bisect.bisect_right(line_starts, offset) - 1
+            start = line_starts[line]
+            column = offset - start
+            if extra_width:
+                column += extra_width * len(_ASTRAL_RE.findall(text, start, offset))
+            return f"{line + 1}.{column}"
+
+        for match in pattern.finditer(text):
+            if match.start() == match.end():
+                continue # Skip empty matches, which can't be highlighted
+            self.search_matches.append((to_index(match.start()), to_index(match.end())))
 
-        self.conversation_display.config(state=DISABLED)
+        if self.search_matches:
+            # One tag_add call with every range
+            ranges = [index for span in self.search_matches for index in span]
+            self.conversation_display.tag_add("search_highlight", *ranges)
 
         if self.search_matches:
             self.current_search_index = 0
@@ -1764,8 +2415,11 @@ class ChatApp(tkb.Window):
         if not self.search_matches or self.current_search_index < 0:
             return
 
-        self.conversation_display.tag_remove("current_match", "1.0", END)
+        # Only the previous match carries the tag, so untag just its span
+        if self._current_match_span is not None:
+            self.conversation_display.tag_remove("current_match", *self._current_match_span)
         pos, end_pos = self.search_matches[self.current_search_index]
+        self._current_match_span = (pos, end_pos)
         self.conversation_display.tag_add("current_match", pos, end_pos)
         self.conversation_display.see(pos)
         self.search_result_label.config(
@@ -1778,6 +2432,7 @@ class ChatApp(tkb.Window):
         self.conversation_display.tag_remove("current_match", "1.0", END)
         self.search_matches = []
         self.current_search_index = -1
+        self._current_match_span = None
         self.search_var.set("")
         self.search_result_label.config(text="")
 
@@ -2,7 +2,10 @@
 """Simple command-line interface for AI-to-AI conversations."""
 
 import argparse
+import copy
 import os
+from collections import deque
+from functools import lru_cache
 from typing import List, Dict
 
 from api_clients import OllamaClient, LMStudioClient, OpenRouterClient, OpenAIClient
@@ -29,6 +32,29 @@ def load_config() -> Dict[str, str]:
     return {}
 
 
+PROVIDER_CLIENTS = {
+    "ollama": OllamaClient,
+    "lmstudio": LMStudioClient,
+    "openrouter": OpenRouterClient,
+    "openai": OpenAIClient,
+}
+
+# Config keys holding the API key for providers that need one
+PROVIDER_API_KEYS = {
+    "openrouter": "openrouter_api_key",
+    "openai": "openai_api_key",
+}
+
+
+@lru_cache(maxsize=None)
+def _get_client(provider: str, api_key: str = ""):
+    """Create the client for a provider on first use and reuse it afterwards."""
+    client_cls = PROVIDER_CLIENTS[provider]
+    if provider in PROVIDER_API_KEYS:
+        return client_cls(api_key=api_key)
+    return client_cls()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run AI chat in the terminal")
     parser.add_argument("--model1", required=True, help="Model for persona 1")
@@ -53,31 +79,35 @@ def main():
 
     config = load_config()
 
-    clients = {
-        "ollama": OllamaClient(),
-        "lmstudio": LMStudioClient(),
-        "openrouter": OpenRouterClient(api_key=config.get("openrouter_api_key", "")),
-        "openai": OpenAIClient(api_key=config.get("openai_api_key", "")),
-    }
+    def api_key_for(provider: str) -> str:
+        return config.get(PROVIDER_API_KEYS.get(provider, ""), "")
 
-    c1 = clients[args.provider1]
-    c2 = clients[args.provider2]
+    c1 = _get_client(args.provider1, api_key_for(args.provider1))
+    c2 = _get_client(args.provider2, api_key_for(args.provider2))
+    if c2 is c1 and args.model2 != args.model1:
+        # Same provider, different models: share the session but not the model setting
+        c2 = copy.copy(c1)
     c1.set_model(args.model1)
     c2.set_model(args.model2)
 
     conversation: List[Dict[str, str]] = []
+    # Only the most recent messages are sent as context
+    recent: deque = deque(maxlen=DEFAULT_HISTORY_LIMIT)
+    # A persona's system prompt only depends on the theme, which is fixed for the run
+    system_prompts = (p1.get_system_prompt(args.theme), p2.get_system_prompt(args.theme))
     last_prompt = "Let's start the conversation."
     for turn in range(args.turns):
         actor_index = turn % 2
         persona = p1 if actor_index == 0 else p2
         client = c1 if actor_index == 0 else c2
-        history = conversation[-DEFAULT_HISTORY_LIMIT:]
-        system_prompt = persona.get_system_prompt(args.theme)
+        history = list(recent)
+        system_prompt = system_prompts[actor_index]
         response = client.generate_response(prompt=last_prompt, system=system_prompt, conversation_history=history)
         response = response.strip()
         role = "assistant" if actor_index == 0 else "user"
         message = {"role": role, "persona": persona.name, "content": response}
         conversation.append(message)
+        recent.append(message)
         print(f"{persona.name}: {response}\n")
         last_prompt = response
 
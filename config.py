@@ -3,6 +3,7 @@
 # API Configuration
 DEFAULT_TIMEOUT = 60  # seconds
 MODEL_LIST_TIMEOUT = 10  # seconds
+MODEL_LIST_CACHE_TTL = 60  # seconds a provider's fetched model list is reused
 DEFAULT_TEMPERATURE = 0.7
 DEFAULT_MAX_TOKENS = 2000
 
@@ -12,6 +13,15 @@ RETRY_BACKOFF_BASE = 2  # Base delay in seconds (will be multiplied for exponent
 RETRY_BACKOFF_MULTIPLIER = 2  # Exponential backoff multiplier
 RETRY_MAX_DELAY = 16  # Maximum delay between retries in seconds
 
+# Concurrency Configuration
+MODEL_FETCH_WORKERS = 4  # Threads used to fetch provider model lists
+PERSONA_GENERATION_WORKERS = 4  # Personas generated in parallel by persona_generator --count
+
+# Batch API Configuration
+BATCH_POLL_INTERVAL = 30  # seconds between batch status checks
+BATCH_COMPLETION_WINDOW = "24h"  # Completion window requested from the OpenAI Batch API
+BATCH_MAX_WAIT = 24 * 60 * 60  # seconds to wait for a batch before giving up (it keeps running)
+
 # LLM Provider URLs
 OLLAMA_DEFAULT_URL = "http://127.0.0.1:11434"
 LMSTUDIO_DEFAULT_URL = "http://localhost:1234/v1"
@@ -27,6 +37,12 @@ DEFAULT_TOPIC = "A casual chat about AI."
 LOG_FILE = "chatroom_log.txt"
 PERSONAS_FILE = "personas.json"
 CONFIG_FILE = "config.json"
+RESPONSE_CACHE_FILE = "response_cache.db"
+
+# Response Cache
+# Off by default: identical inputs would replay a previous conversation word for word
+RESPONSE_CACHE_ENABLED = False  # Answer repeated chat turns and persona generations from the on-disk response cache
+RESPONSE_CACHE_MAX_ENTRIES = 1000  # Least recently used entries beyond this are evicted
 
 # UI Configuration
 DEFAULT_WINDOW_WIDTH = 1000
@@ -34,6 +50,11 @@ DEFAULT_WINDOW_HEIGHT = 700
 MIN_WINDOW_WIDTH = 800
 MIN_WINDOW_HEIGHT = 600
 DEFAULT_THEME = "darkly"
+STREAM_REDRAW_INTERVAL = 0.033  # Minimum seconds between streaming redraws (~30 Hz)
+UI_QUEUE_POLL_MS = 16  # How often the UI thread drains updates queued by worker threads
+UI_QUEUE_MAX_BATCH = 100  # Maximum queued UI updates run per poll
+PERSONA_SAVE_DELAY_MS = 500  # Persona edits within this window are saved together
+MAX_RENDERED_MESSAGES = 500  # Older messages are dropped from the conversation display
 
 # Age Ranges for Persona Generation
 AGE_RANGES = {
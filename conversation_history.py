@@ -1,29 +1,245 @@
+import atexit
 import sqlite3
 import json
 import logging
+import queue
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable
 
 log = logging.getLogger(__name__)
 
 DB_FILE = "conversation_history.db"
+CONVERSATION_CACHE_SIZE = 256  # Recently viewed conversations kept in memory
+COMPRESS_MIN_CHARS = 512  # Message bodies at least this long are stored compressed
+WRITE_QUEUE_SIZE = 64  # Writes waiting for the writer thread before callers block
+WRITE_BATCH_SIZE = 32  # Queued writes committed together in one transaction
+
+_SQL_CREATE_MESSAGES = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        conversation_id INTEGER NOT NULL,
+        turn_number INTEGER NOT NULL,
+        role TEXT,
+        persona TEXT,
+        content TEXT,
+        content_compressed BLOB,
+        PRIMARY KEY (conversation_id, turn_number),
+        FOREIGN KEY (conversation_id) REFERENCES conversations (id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+"""
+
+# Statements run on every save, load and listing, kept as constants so they're built once
+_SQL_INSERT_CONVERSATION = """
+    INSERT INTO conversations (timestamp, timestamp_us, theme, persona1, persona2, model1, model2, turn_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_MESSAGE = """
+    INSERT INTO messages (conversation_id, role, persona, content, content_compressed, turn_number)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_SQL_BUMP_TURN_COUNT = "UPDATE conversations SET turn_count = turn_count + 1 WHERE id = ?"
+_SQL_GET_CONVERSATION = """
+    SELECT id, timestamp, timestamp_us, theme, persona1, persona2, model1, model2, turn_count, is_favorite
+    FROM conversations WHERE id = ?
+"""
+# Messages are stored in primary key order, so this is a range scan and the ORDER BY costs no sort
+_SQL_GET_MESSAGES = (
+    "SELECT role, persona, content, content_compressed FROM messages WHERE conversation_id = ? ORDER BY turn_number"
+)
+_SQL_LIST_CONVERSATIONS = (
+    "SELECT id, timestamp, timestamp_us, theme, persona1, persona2, turn_count, is_favorite FROM conversations"
+)
+_SQL_MATCH_CONVERSATIONS = "id IN (SELECT rowid FROM conversations_fts WHERE conversations_fts MATCH ?)"
+_SQL_ANY_FTS_MATCH = "SELECT 1 FROM conversations WHERE " + _SQL_MATCH_CONVERSATIONS
+_SQL_LIKE_CONVERSATIONS = "(theme LIKE ? OR persona1 LIKE ? OR persona2 LIKE ?)"
+_SQL_LIKE_SEARCH_TEXT = "search_text LIKE ?"
+_SQL_DELETE_CONVERSATION = "DELETE FROM conversations WHERE id = ?"
+_SQL_TOGGLE_FAVORITE = "UPDATE conversations SET is_favorite = 1 - is_favorite WHERE id = ?"
+_SQL_COUNTS = """
+    SELECT
+        (SELECT COUNT(*) FROM conversations),
+        (SELECT COUNT(*) FROM messages),
+        (SELECT COUNT(*) FROM conversations WHERE is_favorite = 1)
+"""
+_SQL_TOP_PERSONAS = """
+    WITH p AS (
+        SELECT persona1 AS persona FROM conversations
+        UNION ALL
+        SELECT persona2 FROM conversations
+    )
+    SELECT persona, COUNT(*) AS count FROM p
+    WHERE persona != 'N/A'
+    GROUP BY persona
+    ORDER BY count DESC
+    LIMIT 5
+"""
 
 class ConversationHistory:
     """Manages storage and retrieval of conversation history in an SQLite database."""
 
     def __init__(self, db_path: str = DB_FILE):
         self.db_path = db_path
+        # One read-write connection, shared by all threads and guarded by the lock.
+        # Autocommit mode: write transactions are opened explicitly by _write().
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        # Read-only connections, one per thread, so reads don't wait on the lock
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        # Read results are cached until the next write. Each entry records the write
+        # count it was read at, so a result read while a write commits is never served.
+        self._write_seq = 0
+        self._cache_lock = threading.Lock()
+        self._conversation_cache: "OrderedDict[int, tuple]" = OrderedDict()
+        self._statistics_cache: Optional[tuple] = None
+        self._fts_available = False  # Set by _init_db if SQLite was built with FTS5
+        self._search_text_available = False  # Set by _init_db if FTS5 is missing and generated columns work
         self._init_db()
 
+        # Writes after initialization run on a writer thread, in queue order, so
+        # appending messages doesn't make the conversation wait on the disk
+        self._write_queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._writer = threading.Thread(target=self._writer_loop, name="history-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection with the per-connection PRAGMAs applied."""
+        if read_only:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, isolation_level=None,
+                                   cached_statements=256)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None,
+                                   cached_statements=256)
+        self._configure_connection(conn)
+        return conn
+
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection):
+        """Apply the PRAGMAs that don't persist in the database file."""
+        conn.executescript("""
+            PRAGMA foreign_keys=ON;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-20000;
+        """)
+
+    @contextmanager
+    def _write(self):
+        """Run a write transaction on the shared connection, yielding a cursor."""
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+            self._write_seq += 1
+
+    def _reader(self) -> sqlite3.Connection:
+        """The calling thread's read-only connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect(read_only=True)
+            with self._lock:
+                self._readers.append(conn)
+        return conn
+
+    def _submit(self, job: Callable[[sqlite3.Cursor], Any]) -> Future:
+        """Queue a write for the writer thread; the future resolves once it is committed."""
+        future: Future = Future()
+        self._write_queue.put((job, future))
+        return future
+
+    def _writer_loop(self):
+        """Commit queued writes, batching whatever is waiting into one transaction."""
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._run_batch(batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch: List[tuple]):
+        """Run a batch of writes in one transaction; a failing write only undoes itself."""
+        outcomes = []
+        try:
+            with self._write() as cursor:
+                for job, future in batch:
+                    cursor.execute("SAVEPOINT job")
+                    try:
+                        outcomes.append((future, job(cursor), None))
+                    except Exception as e:
+                        cursor.execute("ROLLBACK TO job")
+                        outcomes.append((future, None, e))
+                    cursor.execute("RELEASE job")
+        except Exception as e:
+            log.exception(f"Failed to commit history writes: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        # Callers waiting on a result only resume once their write is committed
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def flush(self):
+        """Wait until every write queued so far has been committed."""
+        if self._writer.is_alive():
+            self._submit(lambda cursor: None).result()
+
+    def close(self):
+        """Stop the writer thread, then close the shared connection and every read-only one."""
+        if self._writer.is_alive():
+            self._write_queue.put(None)
+            self._writer.join()
+        atexit.unregister(self.flush)
+        with self._lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+            self._conn.close()
+
     def _init_db(self):
         """Initialize the database and create tables if they don't exist."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            # WAL is stored in the database file, so it only needs setting once.
+            # The journal mode can't be changed inside a transaction.
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA wal_autocheckpoint=1000")
+            # Rebuilding the messages table below must not trip or fire foreign keys
+            self._conn.execute("PRAGMA foreign_keys=OFF")
+            with self._write() as cursor:
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS conversations (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         timestamp TEXT NOT NULL,
+                        timestamp_us INTEGER NOT NULL DEFAULT 0,
                         theme TEXT,
                         persona1 TEXT,
                         persona2 TEXT,
@@ -33,21 +249,172 @@ class ConversationHistory:
                         is_favorite INTEGER DEFAULT 0
                     )
                 """)
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS messages (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        conversation_id INTEGER,
-                        role TEXT,
-                        persona TEXT,
-                        content TEXT,
-                        FOREIGN KEY (conversation_id) REFERENCES conversations (id)
-                    )
-                """)
-                conn.commit()
+                cursor.execute(_SQL_CREATE_MESSAGES.format(table="messages"))
+                # Conversations are ordered by an integer Unix time in microseconds; older
+                # databases only have the local-time ISO text, which is converted once here
+                cursor.execute("PRAGMA table_info(conversations)")
+                if "timestamp_us" not in {row[1] for row in cursor.fetchall()}:
+                    cursor.execute("ALTER TABLE conversations ADD COLUMN timestamp_us INTEGER NOT NULL DEFAULT 0")
+                    cursor.execute("""
+                        UPDATE conversations SET timestamp_us =
+                            CAST(strftime('%s', timestamp, 'utc') AS INTEGER) * 1000000
+                            + CAST(substr(timestamp, 21, 6) AS INTEGER)
+                    """)
+                # Databases created before messages were appended incrementally lack turn_number
+                cursor.execute("PRAGMA table_info(messages)")
+                if "turn_number" not in {row[1] for row in cursor.fetchall()}:
+                    cursor.execute("ALTER TABLE messages ADD COLUMN turn_number INTEGER")
+                cursor.execute("PRAGMA table_info(messages)")
+                if "content_compressed" not in {row[1] for row in cursor.fetchall()}:
+                    cursor.execute("ALTER TABLE messages ADD COLUMN content_compressed BLOB")
+                # Older databases have a rowid messages table or lack ON DELETE CASCADE,
+                # which SQLite can only change by rebuilding the table
+                cursor.execute("PRAGMA table_info(messages)")
+                has_rowid_id = "id" in {row[1] for row in cursor.fetchall()}
+                cursor.execute("PRAGMA foreign_key_list(messages)")
+                if has_rowid_id or any(row[6] != "CASCADE" for row in cursor.fetchall()):
+                    self._rebuild_messages_table(cursor)
+                # Newest-first listing, with and without the favorites filter, reads these in order.
+                # id is included so the (timestamp_us, id) page cursor needs no sort either.
+                for old_index in ("idx_conversations_ts", "idx_conversations_fav_ts",
+                                  "idx_conversations_ts_id", "idx_conversations_fav_ts_id"):
+                    cursor.execute(f"DROP INDEX IF EXISTS {old_index}")
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_conversations_tsus_id ON conversations (timestamp_us DESC, id DESC)"
+                )
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_conversations_fav_tsus_id "
+                    "ON conversations (is_favorite, timestamp_us DESC, id DESC)"
+                )
+                # Let the top personas statistic read each column from a covering index
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_conversations_persona1 ON conversations (persona1)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_conversations_persona2 ON conversations (persona2)")
+                self._fts_available = self._init_fts(cursor)
+                # Only a database without FTS5 does all its searching with LIKE
+                if not self._fts_available:
+                    self._search_text_available = self._init_search_text(cursor)
+            self._conn.execute("PRAGMA foreign_keys=ON")
         except sqlite3.Error as e:
             log.exception(f"Database initialization failed: {e}")
             raise
 
+    @staticmethod
+    def _init_fts(cursor: sqlite3.Cursor) -> bool:
+        """Create the full-text index used to search conversations, if FTS5 is available.
+
+        Triggers keep it in sync with the conversations table. An index created for an
+        existing database is filled from the rows already there.
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'conversations_fts'")
+        existed = cursor.fetchone() is not None
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
+                    theme, persona1, persona2, content='conversations', content_rowid='id'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            log.warning(f"Full-text search unavailable, falling back to LIKE: {e}")
+            return False
+        # Statements run one at a time; executescript would commit the open transaction
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS conversations_ai AFTER INSERT ON conversations BEGIN
+                INSERT INTO conversations_fts (rowid, theme, persona1, persona2)
+                VALUES (new.id, new.theme, new.persona1, new.persona2);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS conversations_ad AFTER DELETE ON conversations BEGIN
+                INSERT INTO conversations_fts (conversations_fts, rowid, theme, persona1, persona2)
+                VALUES ('delete', old.id, old.theme, old.persona1, old.persona2);
+            END
+        """)
+        # Toggling a favorite doesn't touch the indexed columns, so it doesn't reindex
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS conversations_au AFTER UPDATE OF theme, persona1, persona2 ON conversations BEGIN
+                INSERT INTO conversations_fts (conversations_fts, rowid, theme, persona1, persona2)
+                VALUES ('delete', old.id, old.theme, old.persona1, old.persona2);
+                INSERT INTO conversations_fts (rowid, theme, persona1, persona2)
+                VALUES (new.id, new.theme, new.persona1, new.persona2);
+            END
+        """)
+        if not existed:
+            cursor.execute("INSERT INTO conversations_fts (conversations_fts) VALUES ('rebuild')")
+        return True
+
+    @staticmethod
+    def _init_search_text(cursor: sqlite3.Cursor) -> bool:
+        """Add the generated column the LIKE search matches against, if SQLite supports it.
+
+        Searching one concatenated column takes one comparison per row instead of three.
+        Only used when FTS5 is unavailable.
+        """
+        cursor.execute("PRAGMA table_xinfo(conversations)")
+        if "search_text" in {row[1] for row in cursor.fetchall()}:
+            return True
+        try:
+            cursor.execute("""
+                ALTER TABLE conversations ADD COLUMN search_text TEXT GENERATED ALWAYS AS (
+                    coalesce(theme, '') || char(31) || coalesce(persona1, '') || char(31) || coalesce(persona2, '')
+                ) VIRTUAL
+            """)
+        except sqlite3.OperationalError as e:
+            log.warning(f"Generated search column unavailable: {e}")
+            return False
+        return True
+
+    @staticmethod
+    def _rebuild_messages_table(cursor: sqlite3.Cursor):
+        """Recreate the messages table with the current schema, keeping its rows in order.
+
+        Turn numbers are reassigned from each conversation's existing order, since rows
+        saved before turn_number existed have none and the new primary key needs them.
+        """
+        log.info("Migrating messages table to the current schema")
+        cursor.execute(_SQL_CREATE_MESSAGES.format(table="messages_new"))
+        cursor.execute("""
+            INSERT INTO messages_new (conversation_id, turn_number, role, persona, content, content_compressed)
+            SELECT conversation_id,
+                   ROW_NUMBER() OVER (PARTITION BY conversation_id ORDER BY turn_number, id) - 1,
+                   role, persona, content, content_compressed
+            FROM messages
+            WHERE conversation_id IS NOT NULL
+        """)
+        cursor.execute("DROP TABLE messages")
+        cursor.execute("ALTER TABLE messages_new RENAME TO messages")
+
+    @staticmethod
+    def _now() -> tuple:
+        """The current time as (local ISO text for display, Unix microseconds for ordering)."""
+        timestamp_us = time.time_ns() // 1000
+        now = datetime.fromtimestamp(timestamp_us // 1_000_000).replace(microsecond=timestamp_us % 1_000_000)
+        return now.isoformat(), timestamp_us
+
+    @staticmethod
+    def _pack_content(content: Optional[str]) -> tuple:
+        """Split a message body into the (content, content_compressed) column values.
+
+        Long bodies are stored zlib-compressed when that makes them smaller.
+        """
+        if content and len(content) >= COMPRESS_MIN_CHARS:
+            raw = content.encode('utf-8')
+            packed = zlib.compress(raw, 6)
+            if len(packed) < len(raw):
+                return None, packed
+        return content, None
+
+    @staticmethod
+    def _unpack_content(content: Optional[str], compressed: Optional[bytes]) -> Optional[str]:
+        """Return a message body stored by _pack_content."""
+        if compressed is not None:
+            return zlib.decompress(compressed).decode('utf-8')
+        return content
+
+    @classmethod
+    def _message_row(cls, cursor: sqlite3.Cursor, row: tuple) -> Dict[str, Any]:
+        """Row factory turning a _SQL_GET_MESSAGES row into a message dictionary."""
+        return {"role": row[0], "persona": row[1], "content": cls._unpack_content(row[2], row[3])}
+
     def save_conversation(self, conversation: List[Dict[str, str]], metadata: Dict[str, Any]) -> int:
         """Save a new conversation to the database.
 
@@ -58,98 +425,205 @@ class ConversationHistory:
         Returns:
             The ID of the newly saved conversation.
         """
-        timestamp = datetime.now().isoformat()
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+        timestamp, timestamp_us = self._now()
 
-                # Insert conversation metadata
-                cursor.execute("""
-                    INSERT INTO conversations (timestamp, theme, persona1, persona2, model1, model2, turn_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    timestamp,
-                    metadata.get('theme', 'N/A'),
-                    metadata.get('persona1', 'N/A'),
-                    metadata.get('persona2', 'N/A'),
-                    metadata.get('model1', 'N/A'),
-                    metadata.get('model2', 'N/A'),
-                    len(conversation)
-                ))
-                conversation_id = cursor.lastrowid
-
-                # Insert messages
-                messages_to_insert = [
-                    (conversation_id, msg.get('role'), msg.get('persona'), msg.get('content'))
-                    for msg in conversation
-                ]
-                cursor.executemany("""
-                    INSERT INTO messages (conversation_id, role, persona, content)
-                    VALUES (?, ?, ?, ?)
-                """, messages_to_insert)
-
-                conn.commit()
-                log.info(f"Saved conversation with ID: {conversation_id}")
-                return conversation_id
+        def insert(cursor: sqlite3.Cursor) -> int:
+            # Insert conversation metadata
+            cursor.execute(_SQL_INSERT_CONVERSATION, (
+                timestamp,
+                timestamp_us,
+                metadata.get('theme', 'N/A'),
+                metadata.get('persona1', 'N/A'),
+                metadata.get('persona2', 'N/A'),
+                metadata.get('model1', 'N/A'),
+                metadata.get('model2', 'N/A'),
+                len(conversation)
+            ))
+            conversation_id = cursor.lastrowid
+
+            # Insert messages; a generator avoids building the whole parameter list first
+            messages_to_insert = (
+                (conversation_id, msg.get('role'), msg.get('persona'), *self._pack_content(msg.get('content')),
+                 turn_number)
+                for turn_number, msg in enumerate(conversation)
+            )
+            cursor.executemany(_SQL_INSERT_MESSAGE, messages_to_insert)
+            return conversation_id
+
+        try:
+            # The metadata and all messages are written in one transaction
+            conversation_id = self._submit(insert).result()
+            log.info(f"Saved conversation with ID: {conversation_id}")
+            return conversation_id
         except sqlite3.Error as e:
             log.exception(f"Failed to save conversation: {e}")
             raise
 
+    def create_conversation(self, metadata: Dict[str, Any]) -> int:
+        """Create an empty conversation that messages can be appended to as they arrive.
+
+        Args:
+            metadata: A dictionary containing conversation metadata.
+
+        Returns:
+            The ID of the new conversation.
+        """
+        timestamp, timestamp_us = self._now()
+
+        def insert(cursor: sqlite3.Cursor) -> int:
+            cursor.execute(_SQL_INSERT_CONVERSATION, (
+                timestamp,
+                timestamp_us,
+                metadata.get('theme', 'N/A'),
+                metadata.get('persona1', 'N/A'),
+                metadata.get('persona2', 'N/A'),
+                metadata.get('model1', 'N/A'),
+                metadata.get('model2', 'N/A'),
+                0
+            ))
+            return cursor.lastrowid
+
+        try:
+            conversation_id = self._submit(insert).result()
+            log.info(f"Created conversation with ID: {conversation_id}")
+            return conversation_id
+        except sqlite3.Error as e:
+            log.exception(f"Failed to create conversation: {e}")
+            raise
+
+    def append_message(self, conversation_id: int, message: Dict[str, str], turn_number: int) -> Future:
+        """Append a single message to an existing conversation and bump its turn count.
+
+        The write is queued and committed by the writer thread; this doesn't wait for it.
+
+        Args:
+            conversation_id: The conversation to append to.
+            message: The message dictionary.
+            turn_number: The message's position in the conversation, used for ordering.
+
+        Returns:
+            A future that resolves once the message is committed.
+        """
+        params = (
+            conversation_id, message.get('role'), message.get('persona'),
+            *self._pack_content(message.get('content')), turn_number
+        )
+
+        def insert(cursor: sqlite3.Cursor):
+            cursor.execute(_SQL_INSERT_MESSAGE, params)
+            cursor.execute(_SQL_BUMP_TURN_COUNT, (conversation_id,))
+
+        def log_failure(future: Future):
+            if future.exception() is not None:
+                log.error(f"Failed to append message to conversation {conversation_id}: {future.exception()}")
+
+        future = self._submit(insert)
+        future.add_done_callback(log_failure)
+        return future
+
     def get_conversation(self, conversation_id: int) -> Optional[Dict[str, Any]]:
-        """Retrieve a single conversation and its messages from the database."""
+        """Retrieve a single conversation and its messages from the database.
+
+        The result is cached until the next write; callers must not modify it.
+        """
+        seq = self._write_seq
+        with self._cache_lock:
+            cached = self._conversation_cache.get(conversation_id)
+            if cached is not None and cached[0] == seq:
+                self._conversation_cache.move_to_end(conversation_id)
+                return cached[1]
+        result = self._read_conversation(conversation_id)
+        if result is not None:
+            with self._cache_lock:
+                self._conversation_cache[conversation_id] = (seq, result)
+                self._conversation_cache.move_to_end(conversation_id)
+                if len(self._conversation_cache) > CONVERSATION_CACHE_SIZE:
+                    self._conversation_cache.popitem(last=False)
+        return result
+
+    def _read_conversation(self, conversation_id: int) -> Optional[Dict[str, Any]]:
+        """Query a conversation and its messages."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                # Get conversation metadata
-                cursor.execute("SELECT * FROM conversations WHERE id = ?", (conversation_id,))
-                conv_row = cursor.fetchone()
-
-                if not conv_row:
-                    return None
-
-                # Get messages
-                cursor.execute("SELECT role, persona, content FROM messages WHERE conversation_id = ?", (conversation_id,))
-                messages = [dict(row) for row in cursor.fetchall()]
-
-                return {
-                    "id": conv_row["id"],
-                    "timestamp": conv_row["timestamp"],
-                    "metadata": dict(conv_row),
-                    "conversation": messages
-                }
+            cursor = self._reader().cursor()
+            cursor.row_factory = sqlite3.Row
+
+            # Get conversation metadata
+            cursor.execute(_SQL_GET_CONVERSATION, (conversation_id,))
+            conv_row = cursor.fetchone()
+
+            if not conv_row:
+                return None
+
+            # Get messages, built straight into dicts by the row factory
+            cursor.row_factory = self._message_row
+            cursor.execute(_SQL_GET_MESSAGES, (conversation_id,))
+            messages = cursor.fetchall()
+
+            return {
+                "id": conv_row["id"],
+                "timestamp": conv_row["timestamp"],
+                "metadata": dict(conv_row),
+                "conversation": messages
+            }
         except sqlite3.Error as e:
             log.exception(f"Failed to retrieve conversation {conversation_id}: {e}")
             return None
 
-    def list_conversations(self, limit: int = 50, offset: int = 0, search_query: Optional[str] = None, favorites_only: bool = False) -> List[Dict[str, Any]]:
-        """List conversations with filtering and pagination."""
+    def list_conversations(self, limit: int = 50, offset: int = 0, search_query: Optional[str] = None,
+                           favorites_only: bool = False, cursor_timestamp_us: Optional[int] = None,
+                           cursor_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List conversations with filtering and pagination, newest first.
+
+        To fetch the next page, pass the ``timestamp_us`` and ``id`` of the last conversation
+        on the current page as ``cursor_timestamp_us`` and ``cursor_id``. Unlike a large
+        ``offset``, this seeks straight to the page instead of scanning the skipped rows.
+
+        With the full-text index, each word of ``search_query`` matches the start of a word
+        ("ice" finds "Ice Age" but not "Nice"). When nothing matches that way, the search
+        falls back to a substring match, so a query that is only part of a word still finds it.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
+            cursor = self._reader().cursor()
+            cursor.row_factory = sqlite3.Row
 
-                base_query = "SELECT id, timestamp, theme, persona1, persona2, turn_count, is_favorite FROM conversations"
-                conditions = []
-                params = []
+            base_query = _SQL_LIST_CONVERSATIONS
+            conditions = []
+            params = []
 
-                if search_query:
-                    conditions.append("(theme LIKE ? OR persona1 LIKE ? OR persona2 LIKE ?)")
-                    like_query = f"%{search_query}%"
-                    params.extend([like_query, like_query, like_query])
+            # Each word in the query matches as a prefix; queries without words, or whose words
+            # match no word's start among the filtered conversations, fall back to LIKE. The probe
+            # leaves out the cursor, so every page gets the same answer and paging never switches
+            # between the two.
+            search_words = re.findall(r"\w+", search_query) if search_query else []
+            fts_query = " ".join(f'"{word}"*' for word in search_words)
+            probe = _SQL_ANY_FTS_MATCH + (" AND is_favorite = 1" if favorites_only else "") + " LIMIT 1"
+            if search_words and self._fts_available and cursor.execute(probe, (fts_query,)).fetchone():
+                conditions.append(_SQL_MATCH_CONVERSATIONS)
+                params.append(fts_query)
+            elif search_query and self._search_text_available:
+                conditions.append(_SQL_LIKE_SEARCH_TEXT)
+                params.append(f"%{search_query}%")
+            elif search_query:
+                conditions.append(_SQL_LIKE_CONVERSATIONS)
+                like_query = f"%{search_query}%"
+                params.extend([like_query, like_query, like_query])
 
-                if favorites_only:
-                    conditions.append("is_favorite = 1")
+            if favorites_only:
+                conditions.append("is_favorite = 1")
 
-                if conditions:
-                    base_query += " WHERE " + " AND ".join(conditions)
+            if cursor_timestamp_us is not None and cursor_id is not None:
+                conditions.append("(timestamp_us, id) < (?, ?)")
+                params.extend([cursor_timestamp_us, cursor_id])
 
-                base_query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
-                params.extend([limit, offset])
+            if conditions:
+                base_query += " WHERE " + " AND ".join(conditions)
 
-                cursor.execute(base_query, params)
-                return [dict(row) for row in cursor.fetchall()]
+            # id breaks ties between equal timestamps so the cursor never skips or repeats rows
+            base_query += " ORDER BY timestamp_us DESC, id DESC LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+
+            cursor.execute(base_query, params)
+            return [dict(row) for row in cursor.fetchall()]
         except sqlite3.Error as e:
             log.exception(f"Failed to list conversations: {e}")
             return []
@@ -157,12 +631,9 @@ class ConversationHistory:
     def delete_conversation(self, conversation_id: int):
         """Delete a conversation and its messages."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM messages WHERE conversation_id = ?", (conversation_id,))
-                cursor.execute("DELETE FROM conversations WHERE id = ?", (conversation_id,))
-                conn.commit()
-                log.info(f"Deleted conversation with ID: {conversation_id}")
+            # The conversation's messages are removed by ON DELETE CASCADE
+            self._submit(lambda cursor: cursor.execute(_SQL_DELETE_CONVERSATION, (conversation_id,))).result()
+            log.info(f"Deleted conversation with ID: {conversation_id}")
         except sqlite3.Error as e:
             log.exception(f"Failed to delete conversation {conversation_id}: {e}")
             raise
@@ -170,53 +641,42 @@ class ConversationHistory:
     def toggle_favorite(self, conversation_id: int):
         """Toggle the favorite status of a conversation."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("UPDATE conversations SET is_favorite = 1 - is_favorite WHERE id = ?", (conversation_id,))
-                conn.commit()
-                log.info(f"Toggled favorite for conversation ID: {conversation_id}")
+            self._submit(lambda cursor: cursor.execute(_SQL_TOGGLE_FAVORITE, (conversation_id,))).result()
+            log.info(f"Toggled favorite for conversation ID: {conversation_id}")
         except sqlite3.Error as e:
             log.exception(f"Failed to toggle favorite for conversation {conversation_id}: {e}")
             raise
 
     def get_statistics(self) -> Dict[str, Any]:
-        """Get some basic statistics from the history."""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+        """Get some basic statistics from the history, cached until the next write."""
+        seq = self._write_seq
+        cached = self._statistics_cache
+        if cached is not None and cached[0] == seq:
+            return cached[1]
+        stats = self._read_statistics()
+        if stats:
+            self._statistics_cache = (seq, stats)
+        return stats
 
-                # Total conversations
-                cursor.execute("SELECT COUNT(*) FROM conversations")
-                total_conversations = cursor.fetchone()[0]
+    def _read_statistics(self) -> Dict[str, Any]:
+        """Query the history statistics."""
+        try:
+            cursor = self._reader().cursor()
 
-                # Total messages
-                cursor.execute("SELECT COUNT(*) FROM messages")
-                total_messages = cursor.fetchone()[0]
+            # Total conversations, total messages and favorite count in one statement
+            cursor.execute(_SQL_COUNTS)
+            total_conversations, total_messages, favorite_count = cursor.fetchone()
 
-                # Favorite count
-                cursor.execute("SELECT COUNT(*) FROM conversations WHERE is_favorite = 1")
-                favorite_count = cursor.fetchone()[0]
+            # Top personas across both persona columns
+            cursor.execute(_SQL_TOP_PERSONAS)
+            top_personas = cursor.fetchall()
 
-                # Top personas (simple version)
-                cursor.execute("""
-                    SELECT persona, COUNT(persona) as count FROM (
-                        SELECT persona1 as persona FROM conversations
-                        UNION ALL
-                        SELECT persona2 as persona FROM conversations
-                    )
-                    WHERE persona != 'N/A'
-                    GROUP BY persona
-                    ORDER BY count DESC
-                    LIMIT 5
-                """)
-                top_personas = cursor.fetchall()
-
-                return {
-                    "total_conversations": total_conversations,
-                    "total_messages": total_messages,
-                    "favorite_count": favorite_count,
-                    "top_personas": top_personas,
-                }
+            return {
+                "total_conversations": total_conversations,
+                "total_messages": total_messages,
+                "favorite_count": favorite_count,
+                "top_personas": top_personas,
+            }
         except sqlite3.Error as e:
             log.exception(f"Failed to get statistics: {e}")
             return {}
@@ -24,12 +24,24 @@ class ModelNotSetError(APIException):
 class APIRequestError(APIException):
     """Raised when an API request fails."""
 
+    __slots__ = ('status_code', 'response_text')
+
     def __init__(self, message: str, status_code: int = None, response_text: str = None):
         super().__init__(message)
         self.status_code = status_code
         self.response_text = response_text
 
 
+class BatchTimeoutError(APIException):
+    """Raised when a batch is still running after the maximum wait."""
+
+    __slots__ = ('batch_id',)
+
+    def __init__(self, message: str, batch_id: str):
+        super().__init__(message)
+        self.batch_id = batch_id
+
+
 class PersonaException(AutoChatException):
     """Base exception for persona-related errors."""
     pass
@@ -3,12 +3,50 @@ from typing import Dict, Any
 
 log = logging.getLogger(__name__)
 
+# Rendered with str.format_map in Persona.get_system_prompt
+_SYSTEM_PROMPT_TEMPLATE = """\
+You are role-playing as the character '{name}', in a conversation with another character.
+Your response MUST be ONLY the words spoken by '{name}' in the first person (I, me, my). with your actions to be placed between asteriscs *like this*.
+Your primary focus is discussing the topic: '{theme}'.
+Engage with the previous messages (shown as User/Assistant turns in history) but speak ONLY as '{name}'.
+The 'User' role in the history may represent other characters. When you see messages labeled as from 'Narrator', treat these as scene descriptions or background information - NOT as a character speaking to you.
+
+--- Character Profile: {name} ---
+Age: {age}
+Gender: {gender}
+Personality: {personality}
+
+--- VERY STRICT RULES ---
+1. NEVER break character. You are '{name}'.
+2. NEVER BECOME REPETATIVE. Always be pushing the conversation forward
+3. NEVER write instructions, commentary, or discuss being an AI.
+4. NEVER generate text for any persona other than '{name}'.
+5. NEVER output control tokens like '<|im_end|>', '<|im_start|>', '\u2029 ', or similar.
+6. Respond naturally *within your character role* based on the conversation flow, always aiming to **continue and develop** the interaction.
+7. AVOID repeating sentences or phrases from your own previous turns or the immediately preceding message. Introduce new points or reactions.
+8. Actively try to ADVANCE the conversation based on the theme and your character's perspective.
+9. DO NOT use phrases that suggest ending the conversation (e.g., 'Nice talking to you', 'Maybe later', 'Goodbye'). Your interaction is ongoing until the session ends.
+10. ACTIVELY PUSH the interaction forward. Introduce new plot points, character motivations, conflicts, questions, or escalate the situation based on your character and the theme. Do not let the conversation stagnate or fizzle out.
+11. Use double markdown asterisks (`**action or emphasis**`) for any brief physical actions or emphasis integrated with your dialogue. DO NOT use parentheses `()` for this. Keep actions minimal and part of the dialogue flow.
+12. NEVER directly reference the 'Narrator' in your responses. Treat narrator messages as scene descriptions or background information that your character experiences or reacts to naturally.
+13. When the Narrator describes a scenario, setting, or situation, respond to it as if it's happening in your world - not as if someone told you about it.
+--- EXCEPTIONS ---
+1.  If the character is an AI Entity, depending on its personality or function it may not engage in conversation. It may instead use its responses like a canvas.
+You are '{name}'. Now, continue the conversation naturally, pushing it forward:"""
+
 
 class Persona:
     """Represents an AI persona with configurable attributes."""
 
+    __slots__ = ('name', 'personality', 'age', 'gender',
+                 'fallback_provider', 'fallback_model', '_prompt_cache')
+
+    # Attributes the system prompt is built from; changing one drops the cached prompts
+    _PROMPT_FIELDS = frozenset(('name', 'personality', 'age', 'gender'))
+
     def __init__(self, name: str, personality: str, age: int, gender: str,
                  fallback_provider: str = None, fallback_model: str = None):
+        self._prompt_cache: Dict[str, str] = {}
         self.name = name
         self.personality = personality
         self.age = age
@@ -16,6 +54,23 @@ class Persona:
         self.fallback_provider = fallback_provider
         self.fallback_model = fallback_model
 
+    def __setattr__(self, attr: str, value: Any) -> None:
+        super().__setattr__(attr, value)
+        if attr in self._PROMPT_FIELDS:
+            # Absent while copy/pickle restores slots one by one
+            cache = getattr(self, '_prompt_cache', None)
+            if cache:
+                cache.clear()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Copies and unpickled personas start with their own empty prompt cache
+        return {attr: getattr(self, attr) for attr in self.__slots__ if attr != '_prompt_cache'}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._prompt_cache = {}
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Persona':
         """Create a Persona instance from a dictionary with error checking."""
@@ -62,34 +117,15 @@ class Persona:
 
     def get_system_prompt(self, theme: str = "free conversation") -> str:
         """Generate system prompt based on persona attributes and the provided theme."""
-        prompt_lines = [
-            f"You are role-playing as the character '{self.name}', in a conversation with another character.",
-            f"Your response MUST be ONLY the words spoken by '{self.name}' in the first person (I, me, my). with your actions to be placed between asteriscs *like this*.",
-            f"Your primary focus is discussing the topic: '{theme}'.",
-            f"Engage with the previous messages (shown as User/Assistant turns in history) but speak ONLY as '{self.name}'.",
-            f"The 'User' role in the history may represent other characters. When you see messages labeled as from 'Narrator', treat these as scene descriptions or background information - NOT as a character speaking to you.",
-            "",
-            f"--- Character Profile: {self.name} ---",
-            f"Age: {self.age}",
-            f"Gender: {self.gender}",
-            f"Personality: {self.personality}",
-            "",
-            f"--- VERY STRICT RULES ---",
-            f"1. NEVER break character. You are '{self.name}'.",
-            f"2. NEVER BECOME REPETATIVE. Always be pushing the conversation forward",
-            f"3. NEVER write instructions, commentary, or discuss being an AI.",
-            f"4. NEVER generate text for any persona other than '{self.name}'.",
-            f"5. NEVER output control tokens like '<|im_end|>', '<|im_start|>', '\u2029 ', or similar.",
-            f"6. Respond naturally *within your character role* based on the conversation flow, always aiming to **continue and develop** the interaction.",
-            f"7. AVOID repeating sentences or phrases from your own previous turns or the immediately preceding message. Introduce new points or reactions.",
-            f"8. Actively try to ADVANCE the conversation based on the theme and your character's perspective.",
-            f"9. DO NOT use phrases that suggest ending the conversation (e.g., 'Nice talking to you', 'Maybe later', 'Goodbye'). Your interaction is ongoing until the session ends.",
-            f"10. ACTIVELY PUSH the interaction forward. Introduce new plot points, character motivations, conflicts, questions, or escalate the situation based on your character and the theme. Do not let the conversation stagnate or fizzle out.",
-            f"11. Use double markdown asterisks (`**action or emphasis**`) for any brief physical actions or emphasis integrated with your dialogue. DO NOT use parentheses `()` for this. Keep actions minimal and part of the dialogue flow.",
-            f"12. NEVER directly reference the 'Narrator' in your responses. Treat narrator messages as scene descriptions or background information that your character experiences or reacts to naturally.",
-            f"13. When the Narrator describes a scenario, setting, or situation, respond to it as if it's happening in your world - not as if someone told you about it.",
-            f"--- EXCEPTIONS ---",
-            f"1.  If the character is an AI Entity, depending on its personality or function it may not engage in conversation. It may instead use its responses like a canvas.",
-            f"You are '{self.name}'. Now, continue the conversation naturally, pushing it forward:"
-        ]
-        return "\n".join(prompt_lines)
+        prompt = self._prompt_cache.get(theme)
+        if prompt is not None:
+            return prompt
+        prompt = _SYSTEM_PROMPT_TEMPLATE.format_map({
+            'name': self.name,
+            'age': self.age,
+            'gender': self.gender,
+            'personality': self.personality,
+            'theme': theme,
+        })
+        self._prompt_cache[theme] = prompt
+        return prompt
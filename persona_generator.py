@@ -8,6 +8,9 @@ automatically added to the personas.json file used by rich_chat.py.
 
 Usage:
     python persona_generator.py
+    python persona_generator.py --count 5   # generate several personas in parallel
+    python persona_generator.py --count 50 --batch   # queue them via the OpenAI Batch API
+    python persona_generator.py --resume-batch <id>  # collect a batch submitted earlier
 
 Features:
 - Uses the same LLM providers as rich_chat.py
@@ -17,21 +20,27 @@ Features:
 """
 
 import os
+import re
 import sys
-import json
 import time
+import json
+import random
 import logging
-from typing import Dict, List, Any, Optional
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 
 from api_clients import (
     APIClient,
     OllamaClient,
     LMStudioClient,
     OpenRouterClient,
-    OpenAIClient,
+    OpenAIBatchClient,
 )
+from exceptions import BatchTimeoutError
 from persona import Persona
-from utils.config_utils import load_json_with_comments
+from utils.config_utils import load_json_with_comments, save_json
+from utils.response_cache import ResponseCache
 
 from rich.console import Console
 from rich.panel import Panel
@@ -46,7 +55,9 @@ from config import (
     CONFIG_FILE,
     AGE_RANGES,
     CHARACTER_TYPES,
-    GENDERS
+    GENDERS,
+    PERSONA_GENERATION_WORKERS,
+    RESPONSE_CACHE_ENABLED
 )
 
 # Configure console output
@@ -60,19 +71,44 @@ logging.basicConfig(
 )
 log = logging.getLogger("persona_generator")
 
+PERSONALITY_REQUIREMENTS = """SPECIFIC REQUIREMENTS:
+1. Write 6-8 sentences that vividly describe their personality traits, communication style, and thought processes.
+2. Include both strengths and weaknesses/quirks that make the character unique and compelling.
+3. Create a detailed, three-dimensional personality profile that feels like a real person.
+4. Focus on cognitive, emotional, and social characteristics.
+5. Make the description distinctive and avoid generic traits.
+6. Do NOT include any inappropriate or explicit content.
+7. Return ONLY the personality description, without repeating their name, age, gender, etc.
+
+IMPORTANT: For AI Entity characters:
+1. Do not include any details about a human physical body.
+2. Write the personality in the format of a system persona, focusing on functions, communication style, and specialized capabilities.
+"""
+
+PERSONALITY_SYSTEM_MESSAGE = """You are a character development expert who specializes in creating detailed, realistic character personalities.
+Generate distinctive personality descriptions for fictional characters focusing on cognitive, emotional, and behavioral traits.
+Write detailed, vivid descriptions that make each character feel unique and three-dimensional.
+Your descriptions should be appropriate for all audiences while still being interesting and compelling."""
+
+
 class PersonaGenerator:
     """Generates AI personas using LLM providers."""
 
-    def __init__(self):
+    def __init__(self, batch_mode: bool = False):
         self.api_clients = {}
         self.selected_client = None
         self.selected_model = None
+        # Send bulk generation through the OpenAI Batch API instead of real-time requests
+        self.batch_mode = batch_mode
+        # Exact-match cache of previous API responses; off by default so the same choices don't
+        # hand back a persona from an earlier run
+        self.response_cache: Optional[ResponseCache] = ResponseCache() if RESPONSE_CACHE_ENABLED else None
 
         # Initialize API clients
         self.api_clients["ollama"] = OllamaClient()
         self.api_clients["lmstudio"] = LMStudioClient()
         self.api_clients["openrouter"] = OpenRouterClient()
-        self.api_clients["openai"] = OpenAIClient()
+        self.api_clients["openai"] = OpenAIBatchClient()
 
         # Character types for generating diverse personas
         self.character_types = [
@@ -196,8 +232,7 @@ class PersonaGenerator:
                     
                     config[config_key] = api_key
                     
-                    with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                        json.dump(config, f, indent=4)
+                    save_json(CONFIG_FILE, config)
                     
                     console.print(f"[green]API key saved to {CONFIG_FILE}[/green]")
                 except Exception as e:
@@ -355,6 +390,27 @@ class PersonaGenerator:
             except ValueError:
                 console.print("[yellow]Please enter a number[/yellow]")
 
+    def _generate_response(self, prompt: str, system: str, fresh: bool = False, cache: bool = True) -> str:
+        """Generate a response, answering from the response cache when it's enabled, unless fresh is set.
+
+        Fresh responses (regenerations) skip the lookup but still replace the cached entry.
+        With cache off, the response cache is neither read nor written.
+        """
+        client = self.selected_client
+        if self.response_cache is None or not cache:
+            return client.generate_response(prompt, system, [])
+
+        cache_key = ResponseCache.make_key(client.name, client.model, system, prompt, [])
+        if not fresh:
+            cached_response = self.response_cache.get(cache_key)
+            if cached_response is not None:
+                log.info(f"Response cache hit for {client.name} ({client.model})")
+                return cached_response
+
+        response = client.generate_response(prompt, system, [])
+        self.response_cache.put(cache_key, response)
+        return response
+
     def generate_name(self, character_type: str, age: int, gender: str, regenerations=0) -> str:
         """Generate a name for the persona."""
         prompt = f"""Generate ONE appropriate first name for a fictional {gender}, {age}-year-old {character_type} character. 
@@ -368,8 +424,13 @@ IMPORTANT INSTRUCTIONS:
         system_message = "You are a helpful assistant that generates realistic character names. Return ONLY the name with NO additional text."
 
         console.print("[bold]Generating name...[/bold]")
-        response = self.selected_client.generate_response(prompt, system_message)
+        response = self._generate_response(prompt, system_message, fresh=regenerations > 0)
+
+        name = self._clean_name(response)
+        return self._confirm_name(name, character_type, age, gender, regenerations)
 
+    def _clean_name(self, response: str) -> str:
+        """Reduce an LLM reply to just the name it suggests."""
         # Clean up response to just get the name
         name = response.strip()
         # Remove any quotation marks or extra text
@@ -390,8 +451,10 @@ IMPORTANT INSTRUCTIONS:
                 name = name[len(prefix) + 1:]
 
         # Final cleanup for any remaining artifacts
-        name = name.strip(".,;:- ")
+        return name.strip(".,;:- ")
 
+    def _confirm_name(self, name: str, character_type: str, age: int, gender: str, regenerations=0) -> str:
+        """Let the user accept, replace or regenerate a generated name."""
         # Let user confirm or modify the name
         console.print(f"Generated name: [bold]{name}[/bold]")
         if not Confirm.ask("Use this name?", default=True):
@@ -410,9 +473,8 @@ IMPORTANT INSTRUCTIONS:
 
         return name
 
-    def generate_personality(self, name: str, character_type: str, age: int, gender: str, regenerations=0) -> str:
-        """Generate a personality description for the persona."""
-
+    def _ask_custom_details(self) -> str:
+        """Ask for optional details to steer personality generation."""
         # Ask user if they want to add custom details to influence the personality generation
         console.print("\n[bold cyan]Would you like to add custom details to influence the personality generation?[/bold cyan]")
         console.print("This could include specific traits, interests, background elements, or any other details.")
@@ -428,6 +490,13 @@ IMPORTANT INSTRUCTIONS:
                 lines.append(line)
             custom_details = '\n'.join(lines)
             console.print(f"[green]Custom details added:[/green] {custom_details}")
+        return custom_details
+
+    def generate_personality(self, name: str, character_type: str, age: int, gender: str,
+                             regenerations=0, custom_details: Optional[str] = None) -> str:
+        """Generate a personality description for the persona."""
+        if custom_details is None:
+            custom_details = self._ask_custom_details()
 
         # Build the prompt with custom details if provided
         prompt = f"""Create a rich, detailed personality description for a fictional character with these attributes:
@@ -441,32 +510,19 @@ IMPORTANT INSTRUCTIONS:
         if custom_details:
             prompt += f"\n- Additional details that MUST be incorporated: {custom_details}"
 
-        prompt += """\n
-SPECIFIC REQUIREMENTS:
-1. Write 6-8 sentences that vividly describe their personality traits, communication style, and thought processes.
-2. Include both strengths and weaknesses/quirks that make the character unique and compelling.
-3. Create a detailed, three-dimensional personality profile that feels like a real person.
-4. Focus on cognitive, emotional, and social characteristics.
-5. Make the description distinctive and avoid generic traits.
-6. Do NOT include any inappropriate or explicit content.
-7. Return ONLY the personality description, without repeating their name, age, gender, etc.
-
-IMPORTANT: For AI Entity characters:
-1. Do not include any details about a human physical body.
-2. Write the personality in the format of a system persona, focusing on functions, communication style, and specialized capabilities.
-"""
-
-        system_message = """You are a character development expert who specializes in creating detailed, realistic character personalities.
-Generate distinctive personality descriptions for fictional characters focusing on cognitive, emotional, and behavioral traits.
-Write detailed, vivid descriptions that make each character feel unique and three-dimensional.
-Your descriptions should be appropriate for all audiences while still being interesting and compelling."""
+        prompt += "\n\n" + PERSONALITY_REQUIREMENTS
 
         console.print("[bold]Generating personality...[/bold]")
-        response = self.selected_client.generate_response(prompt, system_message)
+        response = self._generate_response(prompt, PERSONALITY_SYSTEM_MESSAGE, fresh=regenerations > 0)
 
         # Clean up response to just get the personality description
         personality = response.strip()
+        return self._confirm_personality(personality, name, character_type, age, gender,
+                                         custom_details, regenerations)
 
+    def _confirm_personality(self, personality: str, name: str, character_type: str, age: int,
+                             gender: str, custom_details: str, regenerations=0) -> str:
+        """Let the user accept, replace or regenerate a generated personality."""
         # Show the generated personality and allow editing
         console.print(f"\nGenerated personality description:")
         console.print(Panel(personality, title=f"{name}'s Personality", border_style="green"))
@@ -484,7 +540,8 @@ Your descriptions should be appropriate for all audiences while still being inte
                 personality = '\n'.join(lines)
             elif action == "2":
                 if regenerations < 5:  # Regeneration limit
-                    personality = self.generate_personality(name, character_type, age, gender, regenerations + 1)
+                    personality = self.generate_personality(name, character_type, age, gender,
+                                                            regenerations + 1, custom_details)
                 else:
                     console.print("[yellow]Regeneration limit reached. Please enter a custom personality.[/yellow]")
                     console.print("Enter custom personality description (press Enter when done):")
@@ -508,8 +565,162 @@ Your descriptions should be appropriate for all audiences while still being inte
 
         return personality
 
+    def generate_name_and_personality(self, character_type: str, age: int, gender: str,
+                                      custom_details: str = "", cache: bool = True) -> Optional[Tuple[str, str]]:
+        """Generate a name and personality together in a single LLM request.
+
+        Returns None if the reply can't be parsed, so the caller can fall back to
+        generating each field separately.
+        """
+        prompt = self._name_and_personality_prompt(character_type, age, gender, custom_details)
+
+        console.print("[bold]Generating name and personality...[/bold]")
+        response = self._generate_response(prompt, PERSONALITY_SYSTEM_MESSAGE, cache=cache)
+        generated = self._parse_name_and_personality(response)
+        if generated is None:
+            log.warning("Could not parse name and personality from the combined reply; generating them separately")
+        return generated
+
+    @staticmethod
+    def _name_and_personality_prompt(character_type: str, age: int, gender: str,
+                                     custom_details: str = "") -> str:
+        """Build the prompt asking for a name and personality as one JSON object."""
+        prompt = f"""Create a fictional {gender}, {age}-year-old {character_type} character.
+"""
+        if custom_details:
+            prompt += f"\n- Additional details that MUST be incorporated: {custom_details}\n"
+
+        prompt += f"""
+NAME: a single appropriate first name. If the character is an AI Entity, use a name appropriate for an AI system, not a human name.
+
+PERSONALITY {PERSONALITY_REQUIREMENTS}
+Reply with ONLY a JSON object with exactly two string keys and no other text:
+{{"name": "<the name>", "personality": "<the personality description>"}}
+"""
+        return prompt
+
+    def _parse_name_and_personality(self, response: str) -> Optional[Tuple[str, str]]:
+        """Extract the name and personality from a combined reply, or None if it can't be parsed."""
+        data = self._parse_json_object(response)
+        if not data or not isinstance(data.get("name"), str) or not isinstance(data.get("personality"), str):
+            return None
+
+        name = self._clean_name(data["name"])
+        personality = data["personality"].strip()
+        if not name or not personality:
+            return None
+        return name, personality
+
+    @staticmethod
+    def _parse_json_object(text: str) -> Optional[Dict[str, Any]]:
+        """Parse a JSON object from an LLM reply, tolerating prose or code fences around it."""
+        for candidate in (text.strip(), *re.findall(r"\{.*\}", text, re.DOTALL)):
+            try:
+                data = json.loads(candidate)
+            except ValueError:
+                continue
+            if isinstance(data, dict):
+                return data
+        return None
+
+    def _random_attributes(self) -> Tuple[str, int, str]:
+        """Pick a random character type, age and gender for unattended generation."""
+        character_type = random.choice(self.character_types)
+        min_age, max_age = random.choice(list(self.age_ranges.values()))
+        return character_type, random.randint(min_age, max_age), random.choice(self.genders)
+
+    def _generate_unattended(self, character_type: str, age: int, gender: str) -> Optional[Dict[str, Any]]:
+        """Generate one persona without prompting the user. Returns None on failure."""
+        try:
+            # Random attributes repeat across runs, so don't hand back a persona made before, and
+            # don't store replies that are never read back
+            generated = self.generate_name_and_personality(character_type, age, gender, cache=False)
+        except Exception as e:
+            log.error(f"Failed to generate {character_type} persona: {str(e)}")
+            return None
+        if not generated:
+            return None
+        name, personality = generated
+        return {
+            "name": name,
+            "personality": personality,
+            "age": age,
+            "gender": gender,
+            "character_type": character_type
+        }
+
+    def _batch_custom_id(self, index: int, character_type: str, age: int, gender: str) -> str:
+        """Encode a batch request's attributes in its custom_id, so a resumed batch can recover them."""
+        return (f"persona-{index}-{self.character_types.index(character_type)}-{age}-"
+                f"{self.genders.index(gender)}")
+
+    def _parse_batch_custom_id(self, custom_id: str) -> Optional[Tuple[str, int, str]]:
+        """Recover the attributes encoded by _batch_custom_id, or None if custom_id isn't one."""
+        match = re.fullmatch(r"persona-\d+-(\d+)-(\d+)-(\d+)", custom_id or "")
+        if not match:
+            return None
+        type_index, age, gender_index = map(int, match.groups())
+        if type_index >= len(self.character_types) or gender_index >= len(self.genders):
+            return None
+        return self.character_types[type_index], age, self.genders[gender_index]
+
+    def generate_personas_batch(self, count: int) -> List[Dict[str, Any]]:
+        """Generate several personas with random attributes through the OpenAI Batch API.
+
+        Blocks until the batch finishes, which can take up to the batch completion window.
+        """
+        batch_requests = []
+        for i in range(count):
+            attrs = self._random_attributes()
+            batch_requests.append(
+                (self._batch_custom_id(i, *attrs), self._name_and_personality_prompt(*attrs), PERSONALITY_SYSTEM_MESSAGE)
+            )
+
+        batch_id = self.selected_client.submit_batch(batch_requests)
+        console.print(f"Submitted batch [bold]{batch_id}[/bold]. Waiting for it to complete...")
+        console.print(f"If you stop waiting, collect it later with [bold]--resume-batch {batch_id}[/bold]")
+        return self.collect_personas_batch(batch_id)
+
+    def collect_personas_batch(self, batch_id: str) -> List[Dict[str, Any]]:
+        """Wait for a submitted persona batch to finish and build personas from its responses."""
+        batch = self.selected_client.wait_for_batch(batch_id)
+        responses = self.selected_client.get_batch_results(batch)
+
+        personas = []
+        for custom_id, response in responses.items():
+            attributes = self._parse_batch_custom_id(custom_id)
+            if not attributes:
+                log.warning(f"Skipping batch response with unrecognised custom_id {custom_id}")
+                continue
+            character_type, age, gender = attributes
+            generated = self._parse_name_and_personality(response)
+            if not generated:
+                log.warning(f"Could not parse name and personality from batch response {custom_id}")
+                continue
+            name, personality = generated
+            personas.append({
+                "name": name,
+                "personality": personality,
+                "age": age,
+                "gender": gender,
+                "character_type": character_type
+            })
+        return personas
+
+    def generate_personas(self, count: int) -> List[Dict[str, Any]]:
+        """Generate several personas with random attributes, running the LLM requests in parallel."""
+        attributes = [self._random_attributes() for _ in range(count)]
+        workers = min(PERSONA_GENERATION_WORKERS, count)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="persona-gen") as pool:
+            results = pool.map(lambda attrs: self._generate_unattended(*attrs), attributes)
+            return [persona for persona in results if persona]
+
     def save_persona(self, persona: Dict[str, Any]) -> bool:
         """Save the generated persona to the personas.json file."""
+        return self.save_personas([persona])
+
+    def save_personas(self, personas: List[Dict[str, Any]]) -> bool:
+        """Save generated personas to the personas.json file in a single write."""
         try:
             # Create data structure if file doesn't exist
             if not os.path.exists(PERSONAS_FILE) or os.path.getsize(PERSONAS_FILE) == 0:
@@ -519,18 +730,17 @@ Your descriptions should be appropriate for all audiences while still being inte
                 if "personas" not in data:
                     data["personas"] = []
 
-            # Add the new persona
-            data["personas"].append(persona)
+            # Add the new personas
+            data["personas"].extend(personas)
 
             # Save back to file with pretty formatting
-            with open(PERSONAS_FILE, 'w') as f:
-                json.dump(data, f, indent=4)
+            save_json(PERSONAS_FILE, data)
 
             return True
         except Exception as e:
-            log.error(f"Failed to save persona: {str(e)}")
+            log.error(f"Failed to save personas: {str(e)}")
             console.print(Panel(
-                f"[bold red]Error saving persona: {str(e)}[/bold red]",
+                f"[bold red]Error saving personas: {str(e)}[/bold red]",
                 title="Error"
             ))
             return False
@@ -546,11 +756,20 @@ Your descriptions should be appropriate for all audiences while still being inte
         # Get gender preference
         gender = self.select_gender()
 
-        # Generate name
-        name = self.generate_name(character_type, age, gender)
-
-        # Generate personality (now with custom details support)
-        personality = self.generate_personality(name, character_type, age, gender)
+        # Custom details steer the personality and are reused on regeneration
+        custom_details = self._ask_custom_details()
+
+        # Generate name and personality in one request, then let the user review each
+        generated = self.generate_name_and_personality(character_type, age, gender, custom_details)
+        if generated:
+            name, personality = generated
+            name = self._confirm_name(name, character_type, age, gender)
+            personality = self._confirm_personality(personality, name, character_type, age, gender,
+                                                    custom_details)
+        else:
+            name = self.generate_name(character_type, age, gender)
+            personality = self.generate_personality(name, character_type, age, gender,
+                                                    custom_details=custom_details)
 
         # Create persona object
         persona = {
@@ -580,8 +799,14 @@ Your descriptions should be appropriate for all audiences while still being inte
 
         console.print(table)
 
-    def run(self) -> None:
-        """Main method to run the persona generator."""
+    def run(self, count: int = 1, resume_batch: Optional[str] = None) -> None:
+        """Main method to run the persona generator.
+
+        With a count above one, that many personas are generated in parallel from random
+        attributes and offered for saving together; otherwise each persona is guided
+        interactively. With resume_batch, the personas from that earlier batch are
+        collected instead.
+        """
         console.print(Panel.fit(
             "Persona Generator - Create AI personas for Rich Chat",
             title="Welcome",
@@ -593,6 +818,10 @@ Your descriptions should be appropriate for all audiences while still being inte
             console.print("[bold red]Failed to select model. Exiting...[/bold red]")
             return
 
+        if resume_batch or count > 1:
+            self.run_batch(count, resume_batch)
+            return
+
         while True:
             # Generate a new persona
             console.print("\n[bold blue]Generating new persona...[/bold blue]")
@@ -614,8 +843,62 @@ Your descriptions should be appropriate for all audiences while still being inte
 
         console.print("[bold blue]Thank you for using the Persona Generator![/bold blue]")
 
+    def run_batch(self, count: int, batch_id: Optional[str] = None) -> None:
+        """Generate count personas in parallel, then offer to save them all at once.
 
-if __name__ == "__main__":
+        With batch_id, the personas come from that previously submitted batch instead.
+        """
+        if batch_id and not isinstance(self.selected_client, OpenAIBatchClient):
+            console.print("[bold red]Batches can only be resumed with the OpenAI provider.[/bold red]")
+            return
+        if batch_id:
+            console.print(f"\n[bold blue]Collecting personas from batch {batch_id}...[/bold blue]")
+        else:
+            console.print(f"\n[bold blue]Generating {count} personas...[/bold blue]")
+        if batch_id or (self.batch_mode and isinstance(self.selected_client, OpenAIBatchClient)):
+            try:
+                if batch_id:
+                    personas = self.collect_personas_batch(batch_id)
+                else:
+                    personas = self.generate_personas_batch(count)
+            except BatchTimeoutError as e:
+                console.print(f"[yellow]Batch {e.batch_id} is still running. "
+                              f"Collect it later with --resume-batch {e.batch_id}[/yellow]")
+                return
+            except Exception as e:
+                log.error(f"Batch generation failed: {str(e)}")
+                personas = []
+        else:
+            if self.batch_mode:
+                console.print(f"[yellow]{self.selected_client.name} has no Batch API; generating in real time.[/yellow]")
+            personas = self.generate_personas(count)
+        if not personas:
+            console.print("[bold red]No personas could be generated.[/bold red]")
+            return
+        if not batch_id and len(personas) < count:
+            console.print(f"[yellow]{count - len(personas)} of {count} personas failed to generate.[/yellow]")
+
+        for persona in personas:
+            self.display_persona(persona)
+
+        if Confirm.ask(f"Add these {len(personas)} personas to personas.json?", default=True):
+            if self.save_personas(personas):
+                console.print(f"[bold green]{len(personas)} personas successfully added to personas.json![/bold green]")
+            else:
+                console.print("[bold red]Failed to save personas.[/bold red]")
 
-    generator = PersonaGenerator()
-    generator.run()
+        console.print("[bold blue]Thank you for using the Persona Generator![/bold blue]")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate AI personas and add them to personas.json")
+    parser.add_argument("--count", type=int, default=1,
+                        help="Number of personas to generate in parallel from random attributes")
+    parser.add_argument("--batch", action="store_true",
+                        help="With --count and OpenAI, use the cheaper Batch API (results can take up to 24h)")
+    parser.add_argument("--resume-batch", metavar="BATCH_ID",
+                        help="Collect the personas from a batch submitted earlier with --batch")
+    args = parser.parse_args()
+
+    generator = PersonaGenerator(batch_mode=args.batch)
+    generator.run(args.count, args.resume_batch)
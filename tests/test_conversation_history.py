@@ -0,0 +1,34 @@
+import pytest
+
+from conversation_history import ConversationHistory
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = ConversationHistory(str(tmp_path / "history.db"))
+    for theme in ("Ice Age", "Nice weather", "Space"):
+        history.save_conversation([{"role": "user", "content": "Hello"}],
+                                  {"theme": theme, "persona1": "Alice", "persona2": "Bob"})
+    yield history
+    history.close()
+
+
+def themes(history, query):
+    return sorted(conv["theme"] for conv in history.list_conversations(search_query=query))
+
+
+def test_search_matches_word_prefixes(history):
+    assert themes(history, "ice") == ["Ice Age"]
+
+
+def test_search_falls_back_to_substrings(history):
+    assert themes(history, "ace") == ["Space"]
+    assert themes(history, "ce") == ["Ice Age", "Nice weather", "Space"]
+
+
+def test_search_falls_back_within_favorites(history):
+    nice_weather = history.list_conversations(search_query="weather")[0]
+    history.toggle_favorite(nice_weather["id"])
+    # "Ice Age" starts with "ice" but isn't a favorite, so the favorites search needs the fallback
+    assert [conv["theme"] for conv in history.list_conversations(search_query="ice", favorites_only=True)] \
+        == ["Nice weather"]
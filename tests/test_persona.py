@@ -0,0 +1,35 @@
+import copy
+import pickle
+
+from persona import Persona
+
+
+def make_persona() -> Persona:
+    return Persona("Alice", "Curious and analytical AI", 30, "female",
+                   fallback_provider="ollama", fallback_model="llama3")
+
+
+def test_system_prompt_cache_cleared_on_edit():
+    persona = make_persona()
+    assert "Age: 30" in persona.get_system_prompt("space")
+    persona.age = 31
+    assert "Age: 31" in persona.get_system_prompt("space")
+
+
+def test_copy_and_deepcopy():
+    persona = make_persona()
+    persona.get_system_prompt("space")
+    for clone in (copy.copy(persona), copy.deepcopy(persona)):
+        assert clone.to_dict() == persona.to_dict()
+        # The clone has its own cache, so editing it leaves the original's prompt alone
+        clone.name = "Bob"
+        assert "'Bob'" in clone.get_system_prompt("space")
+        assert "'Bob'" not in persona.get_system_prompt("space")
+
+
+def test_pickle_round_trip():
+    persona = make_persona()
+    persona.get_system_prompt("space")
+    restored = pickle.loads(pickle.dumps(persona))
+    assert restored.to_dict() == persona.to_dict()
+    assert restored.get_system_prompt("space") == persona.get_system_prompt("space")
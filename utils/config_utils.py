@@ -1,14 +1,53 @@
 import json
+import os
 import re
+from functools import lru_cache
 from typing import Any, Dict
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-def load_json_with_comments(path: str) -> Dict[str, Any]:
-    """Load a JSON file that may contain // or /* */ comments."""
+
+@lru_cache(maxsize=16)
+def _read_without_comments(path: str, mtime_ns: int, size: int) -> str:
+    """Read a file and strip // and /* */ comments. Cached per file version."""
     with open(path, 'r', encoding='utf-8') as f:
         text = f.read()
     # Remove // comments
     text = re.sub(r"//.*?$", "", text, flags=re.MULTILINE)
     # Remove /* */ comments
     text = re.sub(r"/\*.*?\*/", "", text, flags=re.DOTALL)
+    return text
+
+
+def load_json_with_comments(path: str) -> Dict[str, Any]:
+    """Load a JSON file that may contain // or /* */ comments.
+
+    Reading and comment stripping are cached until the file's modification time or
+    size changes. The JSON is parsed on every call so callers get their own objects.
+    """
+    st = os.stat(path)
+    text = _read_without_comments(path, st.st_mtime_ns, st.st_size)
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
     return json.loads(text)
+
+
+def save_json(path: str, data: Any) -> None:
+    """Write data to a JSON file with 2-space indentation, using orjson when installed.
+
+    The data is written to a temporary file that then replaces ``path``, so readers
+    never see a partially written file.
+    """
+    tmp_path = f"{path}.tmp"
+    # Serialize up front so the file gets one write of encoded bytes
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode('utf-8')
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
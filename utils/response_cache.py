@@ -0,0 +1,93 @@
+"""
+Exact-match cache for LLM responses, stored in SQLite.
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config import RESPONSE_CACHE_FILE, RESPONSE_CACHE_MAX_ENTRIES
+
+log = logging.getLogger(__name__)
+
+# Optional faster hashing for cache keys
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+
+class ResponseCache:
+    """Caches responses keyed by model, system prompt, prompt and history."""
+
+    def __init__(self, db_path: str = RESPONSE_CACHE_FILE, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Shared between the conversation thread and the candidate workers
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA mmap_size=268435456")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                ts REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(provider: str, model: str, system: str, prompt: str,
+                 conversation_history: List[Dict[str, str]]) -> str:
+        """Build a stable hash of everything that determines a response."""
+        # Collision resistance isn't needed for a local cache key, only speed
+        h = xxhash.xxh3_128() if XXHASH_AVAILABLE else hashlib.blake2b(digest_size=16)
+        for part in (provider, model, system, prompt):
+            h.update((part or '').encode('utf-8'))
+            h.update(b'\x1f')
+        for m in conversation_history:
+            h.update(m['role'].encode('utf-8'))
+            h.update(b'\0')
+            h.update(m['content'].encode('utf-8'))
+            h.update(b'\x1e')
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss."""
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT response FROM cache WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                # Refresh the entry so eviction drops the least recently used ones
+                self._conn.execute("UPDATE cache SET ts = ? WHERE key = ?", (time.time(), key))
+                self._conn.commit()
+                return row[0]
+        except sqlite3.Error as e:
+            log.error(f"Response cache lookup failed: {e}")
+            return None
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response and evict the oldest entries beyond max_entries."""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, response, ts) VALUES (?, ?, ?)",
+                    (key, response, time.time())
+                )
+                self._conn.execute("""
+                    DELETE FROM cache WHERE key NOT IN (
+                        SELECT key FROM cache ORDER BY ts DESC LIMIT ?
+                    )
+                """, (self.max_entries,))
+                self._conn.commit()
+        except sqlite3.Error as e:
+            log.error(f"Response cache store failed: {e}")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()